@@ -0,0 +1,193 @@
+"""Solve a batch of puzzles in parallel worker processes.
+
+Reads puzzles from a JSON Lines file, one puzzle per line in the format
+of serialization.py, with an optional "id". Each puzzle is solved in its
+own process with a timeout and a memory cap, so a pathological board is
+killed without stalling the rest of the batch. One result per puzzle is
+appended to the output file as soon as it finishes:
+
+    python batch.py puzzles.jsonl results.jsonl --solver dlx --workers 8 \
+        --timeout 60 --memory-mb 1024
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from serialization import puzzle_from_dict
+from solvers.registry import SOLVERS, peak_rss_kb
+from solvers.solution import get_solution
+from solvers.stats import SearchStats
+
+
+def _solve_in_child(puzzle: dict, solver_name: str, memory_mb, conn):
+    """Process target: solve one puzzle and send back a result."""
+    if memory_mb is not None and resource is not None:
+        cap = int(memory_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, cap))
+
+    stats = SearchStats()
+    try:
+        G = puzzle_from_dict(puzzle)
+        start = time.perf_counter()
+        solution = SOLVERS[solver_name](G, stats)
+        result = {
+            "status": "solved" if solution is not None else "unsolvable",
+            "wall_time": time.perf_counter() - start,
+            "solution": (
+                [
+                    [piece.code, point[0], point[1], orientation]
+                    for piece, point, orientation in get_solution(solution)
+                ]
+                if solution is not None
+                else None
+            ),
+        }
+    except MemoryError:
+        result = {"status": "memory", "error": "Memory cap exceeded"}
+    except Exception as e:
+        result = {"status": "error", "error": repr(e)}
+
+    result["stats"] = stats.as_dict()
+    result["peak_rss_kb"] = peak_rss_kb()
+    try:
+        conn.send(result)
+    except MemoryError:
+        conn.send({"status": "memory", "error": "Memory cap exceeded"})
+    conn.close()
+
+
+def iter_batch(puzzles, solver="dlx", workers=None, timeout=None, memory_mb=None):
+    """Solve every puzzle of an iterable of (id, puzzle dict) pairs, each in
+    a fresh process, at most `workers` at a time. A puzzle given as the
+    exception raised while reading it gets an error result right away.
+
+    Yields one result per puzzle, in the order they finish, with a
+    "status" of "solved", "unsolvable", "timeout", "memory" or "error".
+    """
+    if solver not in SOLVERS:
+        raise KeyError(f"Unknown solver: {solver}")
+    workers = workers or os.cpu_count()
+    pending = iter(puzzles)
+    running = {}
+
+    def start(puzzle_id, puzzle):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_solve_in_child, args=(puzzle, solver, memory_mb, sender)
+        )
+        process.start()
+        sender.close()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        running[receiver] = (puzzle_id, process, deadline)
+
+    def finish(receiver, result):
+        puzzle_id, process, _ = running.pop(receiver)
+        if result["status"] == "timeout":
+            process.terminate()
+        process.join()
+        receiver.close()
+        return dict({"id": puzzle_id, "solver": solver}, **result)
+
+    exhausted = False
+    while running or not exhausted:
+        while not exhausted and len(running) < workers:
+            item = next(pending, None)
+            if item is None:
+                exhausted = True
+            elif isinstance(item[1], Exception):
+                puzzle_id, error = item
+                yield {
+                    "id": puzzle_id,
+                    "solver": solver,
+                    "status": "error",
+                    "error": repr(error),
+                }
+            else:
+                start(*item)
+        if not running:
+            break
+
+        deadlines = [d for _, _, d in running.values() if d is not None]
+        wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+        for receiver in wait(list(running), timeout=wait_for):
+            try:
+                result = receiver.recv()
+            except EOFError:
+                # Killed from outside, e.g. by the kernel out of memory
+                result = {"status": "error", "error": "Solver process died"}
+            yield finish(receiver, result)
+
+        now = time.monotonic()
+        for receiver, (_, _, deadline) in list(running.items()):
+            if deadline is not None and now >= deadline:
+                yield finish(receiver, {"status": "timeout", "wall_time": timeout})
+
+
+def read_puzzles(path: str):
+    """Lazily yield (id, puzzle dict) from a JSON Lines file, using the line
+    number as the id of puzzles without one. A line that is not a JSON
+    object is yielded as (line number, the error) instead."""
+    with open(path) as f:
+        for n, line in enumerate(f, start=1):
+            if line.strip():
+                try:
+                    puzzle = json.loads(line)
+                    if not isinstance(puzzle, dict):
+                        raise ValueError("Puzzle is not a JSON object")
+                except ValueError as e:
+                    yield n, e
+                    continue
+                yield puzzle.get("id", n), puzzle
+
+
+def run_batch(input_path: str, output_path: str, verbose=False, **options) -> dict:
+    """Solve every puzzle in `input_path`, appending one JSON line per
+    result to `output_path` as soon as it finishes. Takes the options of
+    `iter_batch`. Returns the number of results by status."""
+    counts = {}
+    with open(output_path, "a") as out:
+        for result in iter_batch(read_puzzles(input_path), **options):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            if verbose:
+                print(result["id"], result["status"])
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="Puzzles, one JSON object per line")
+    parser.add_argument("output", help="Results are appended here, one per line")
+    parser.add_argument(
+        "--solver", choices=list(SOLVERS), default="dlx", help="(default: dlx)"
+    )
+    parser.add_argument("--workers", type=int, help="(default: number of CPUs)")
+    parser.add_argument("--timeout", type=float, help="Seconds per puzzle")
+    parser.add_argument("--memory-mb", type=float, help="Memory cap per puzzle")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    counts = run_batch(
+        args.input,
+        args.output,
+        verbose=not args.quiet,
+        solver=args.solver,
+        workers=args.workers,
+        timeout=args.timeout,
+        memory_mb=args.memory_mb,
+    )
+    print(", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    main()
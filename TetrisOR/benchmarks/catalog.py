@@ -0,0 +1,119 @@
+import os
+
+from game import Game
+from pieces import COLORS, PIECE_SETS_DIR, load_piece_set
+
+ALL_PIECES = {piece.code: 1 for piece in COLORS}
+PENTOMINOES = load_piece_set(os.path.join(PIECE_SETS_DIR, "pentominoes.json"))
+
+# One solution of the full 11x5 board, as (code, x, y, orientation).
+# The challenge instances keep some of these pieces in place.
+FULL_BOARD_SOLUTION = [
+    ("CY", 1, 1, -4),
+    ("IN", 1, 0, -2),
+    ("MR", 0, 2, 1),
+    ("RE", 0, 3, 1),
+    ("TE", 3, 2, -4),
+    ("AB", 4, 0, -2),
+    ("WI", 5, 1, -3),
+    ("YE", 4, 4, 1),
+    ("OR", 6, 3, 3),
+    ("MI", 9, 1, 3),
+    ("MA", 9, 3, 4),
+    ("EG", 10, 3, -3),
+]
+
+# Puzzle instances, roughly from trivial to hard. Each has a grid shape,
+# the full piece multiset, and the pieces already placed on the grid.
+INSTANCES = [
+    {
+        "name": "demo-5x3",
+        "grid_shape": (5, 3),
+        "pieces": {"MI": 1, "EG": 1, "YE": 1},
+        "placed": [],
+    },
+    {
+        "name": "square-4x4",
+        "grid_shape": (4, 4),
+        "pieces": {"CY": 1, "IN": 1, "MR": 1, "AB": 1},
+        "placed": [],
+    },
+    {
+        "name": "teal-4x3-unsolvable",
+        "grid_shape": (4, 3),
+        "pieces": {"TE": 3},
+        "placed": [],
+    },
+    {
+        "name": "small-5x4",
+        "grid_shape": (5, 4),
+        "pieces": {"CY": 1, "IN": 1, "MR": 1, "TE": 1, "AB": 1},
+        "placed": [],
+    },
+    {
+        "name": "medium-6x5",
+        "grid_shape": (6, 5),
+        "pieces": {piece.code: 1 for piece in COLORS[:7]},
+        "placed": [],
+    },
+    {
+        "name": "medium-8x5",
+        "grid_shape": (8, 5),
+        "pieces": {
+            code: 1 for code in ["CY", "IN", "MR", "TE", "AB", "EG", "MA", "MI", "RE"]
+        },
+        "placed": [],
+    },
+    {
+        "name": "challenge-11x5-easy",
+        "grid_shape": (11, 5),
+        "pieces": ALL_PIECES,
+        "placed": FULL_BOARD_SOLUTION[:8],
+    },
+    {
+        "name": "challenge-11x5-medium",
+        "grid_shape": (11, 5),
+        "pieces": ALL_PIECES,
+        "placed": FULL_BOARD_SOLUTION[:5],
+    },
+    {
+        "name": "challenge-11x5-hard",
+        "grid_shape": (11, 5),
+        "pieces": ALL_PIECES,
+        "placed": FULL_BOARD_SOLUTION[:2],
+    },
+    {
+        "name": "large-10x5",
+        "grid_shape": (10, 5),
+        "pieces": {code: 1 for code in ALL_PIECES if code != "OR"},
+        "placed": [],
+    },
+    {
+        "name": "full-11x5",
+        "grid_shape": (11, 5),
+        "pieces": ALL_PIECES,
+        "placed": [],
+    },
+    {
+        "name": "pentomino-10x6",
+        "grid_shape": (10, 6),
+        "pieces": {piece.code: 1 for piece in PENTOMINOES},
+        "placed": [],
+    },
+]
+
+
+def get_instance(name: str) -> dict:
+    for instance in INSTANCES:
+        if instance["name"] == name:
+            return instance
+    raise KeyError(f"Unknown instance: {name}")
+
+
+def make_game(instance: dict) -> Game:
+    """Build the game for a puzzle instance, with its pieces placed."""
+    return Game(
+        grid_shape=instance["grid_shape"],
+        pieces=dict(instance["pieces"]),
+        placed=instance["placed"],
+    )
@@ -0,0 +1,178 @@
+"""Benchmark harness for TetrisOR solvers.
+
+Runs every (instance, solver) pair in a fresh process with a timeout,
+and records wall time, nodes expanded, backtracks and peak memory.
+
+Run from the TetrisOR directory:
+
+    python -m benchmarks.run --solvers dlx heuristic-min-cell --timeout 60 \
+        --output results.json
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from benchmarks.catalog import INSTANCES, get_instance, make_game
+from solvers.registry import SOLVERS, peak_rss_kb
+from solvers.stats import SearchStats
+
+FIELDS = [
+    "instance",
+    "solver",
+    "status",
+    "wall_time",
+    "nodes",
+    "backtracks",
+    "peak_rss_kb",
+    "commit",
+    "error",
+]
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_in_child(instance_name: str, solver_name: str, conn):
+    """Process target: solve one instance and send back a record."""
+    stats = SearchStats()
+    try:
+        G = make_game(get_instance(instance_name))
+        solve = SOLVERS[solver_name]
+        start = time.perf_counter()
+        solution = solve(G, stats)
+        wall_time = time.perf_counter() - start
+        record = {
+            "status": "solved" if solution is not None else "unsolvable",
+            "wall_time": wall_time,
+            "error": None,
+        }
+    except Exception as e:
+        record = {"status": "error", "wall_time": None, "error": repr(e)}
+
+    record.update(stats.as_dict())
+    record["peak_rss_kb"] = peak_rss_kb()
+    conn.send(record)
+    conn.close()
+
+
+def run_one(instance_name: str, solver_name: str, timeout: float = None) -> dict:
+    """Solve one instance with one solver in a fresh process.
+    Return its benchmark record."""
+    if solver_name not in SOLVERS:
+        raise KeyError(f"Unknown solver: {solver_name}")
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_run_in_child, args=(instance_name, solver_name, sender)
+    )
+    process.start()
+    sender.close()
+
+    record = {"instance": instance_name, "solver": solver_name}
+    if receiver.poll(timeout):
+        try:
+            record.update(receiver.recv())
+        except EOFError:
+            record.update(status="error", error="Solver process died")
+    else:
+        process.terminate()
+        record.update(status="timeout", wall_time=timeout)
+    process.join()
+    receiver.close()
+
+    for field in FIELDS:
+        record.setdefault(field, None)
+    return record
+
+
+def run_benchmarks(instances=None, solvers=None, timeout=60, verbose=False) -> list:
+    """Run every solver on every instance. Return a list of records."""
+    instances = instances or [instance["name"] for instance in INSTANCES]
+    solvers = solvers or list(SOLVERS)
+    commit = current_commit()
+
+    records = []
+    for instance_name in instances:
+        for solver_name in solvers:
+            record = run_one(instance_name, solver_name, timeout=timeout)
+            record["commit"] = commit
+            records.append(record)
+            if verbose:
+                wall_time = record["wall_time"]
+                print(
+                    "{:<24} {:<22} {:<10} {:>10} {:>10}".format(
+                        instance_name,
+                        solver_name,
+                        record["status"],
+                        f"{wall_time:.3f}s" if wall_time is not None else "-",
+                        record["nodes"] if record["nodes"] is not None else "-",
+                    )
+                )
+    return records
+
+
+def write_results(records: list, path: str):
+    """Write records to `path`, as CSV if it ends in .csv, else as JSON."""
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for record in records:
+                writer.writerow({field: record[field] for field in FIELDS})
+    else:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "results": records,
+                },
+                f,
+                indent=2,
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--instances",
+        nargs="+",
+        choices=[instance["name"] for instance in INSTANCES],
+        help="Instances to run (default: all)",
+    )
+    parser.add_argument(
+        "--solvers", nargs="+", choices=list(SOLVERS), help="Solvers (default: all)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=60, help="Seconds per run (default: 60)"
+    )
+    parser.add_argument("--output", help="Write results to a .json or .csv file")
+    args = parser.parse_args(argv)
+
+    records = run_benchmarks(
+        instances=args.instances,
+        solvers=args.solvers,
+        timeout=args.timeout,
+        verbose=True,
+    )
+    if args.output:
+        write_results(records, args.output)
+        print(f"Results written to {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,150 @@
-from functools import reduce
-from pieces import Piece, DIRECTIONS, COLORS
-from utils import Field, PointIndexed, Point
+from array import array
 
+try:
+    import numpy as np
+except ImportError:  # Optional, only needed for the array views of the grid
+    np = None
+
+from pieces import Piece, DISTINCT_ORIENTATIONS, get_piece, orientation_offsets
+from utils import Point
+
+_BITMASKS = {}
+
+
+def piece_bitmask(code: str, orientation: int, width: int) -> tuple:
+    """Return the bitmask of piece `code` in `orientation`,
+    for a row-major bitboard `width` fields wide.
+
+    Returns (node offsets, (min dx, min dy, max dx, max dy), mask),
+    where the mask is aligned so that the top-left corner of the
+    piece's bounding box sits at bit 0. Results are cached per
+    piece type, orientation and board width.
+    """
+    key = (code, orientation, width)
+    cached = _BITMASKS.get(key)
+    if cached is None:
+        offsets = orientation_offsets(code, orientation)
+        xs = [dx for dx, _ in offsets]
+        ys = [dy for _, dy in offsets]
+        min_dx, min_dy = min(xs), min(ys)
+        mask = 0
+        for dx, dy in offsets:
+            mask |= 1 << ((dy - min_dy) * width + (dx - min_dx))
+        cached = (offsets, (min_dx, min_dy, max(xs), max(ys)), mask)
+        _BITMASKS[key] = cached
+
+    return cached
+
+
+class FieldView:
+    """View of a single field in the grid, created on demand.
+
+    Points to a node of a piece, represented as (obj, int)
+    where obj = piece instance and int = node id.
+    Reads and writes go straight to the grid's arrays.
+    """
+
+    __slots__ = ("_grid", "_index")
+
+    def __init__(self, grid, index: int):
+        self._grid = grid
+        self._index = index
+
+    @property
+    def point(self) -> Point:
+        return Point(self._index % self._grid._Nx, self._index // self._grid._Nx)
+
+    @property
+    def node(self) -> tuple:
+        return self._grid._node_at(self._index)
+
+    @node.setter
+    def node(self, value: tuple):
+        self._grid._set_node(self._index, *value)
+
+    def __repr__(self):
+        return f"<{self.point}>"
+
+
+class Grid:
+    """Grid of Nx by Ny fields, stored as flat row-major arrays.
+
+    Field (x, y) is index y * Nx + x. `_slots` holds a small integer id
+    per field, indexing the list of placed pieces in `_slot_pieces`
+    (0 for an empty field), and `_nodes` the node id of the piece on
+    that field (-1 for an empty field). The occupied fields are also
+    kept as a bitboard in `_occupied`, with the same indexing.
+    """
 
-class Grid(PointIndexed):
     def __init__(self, Nx, Ny):
-        fields = self._make_list(Nx, Ny)
-        super().__init__(fields)
+        self._Nx, self._Ny = Nx, Ny
+        size = Nx * Ny
+        # Every piece covers at least one field, so ids never exceed the size
+        self._slots = array("b" if size < 128 else "l", [0]) * size
+        self._nodes = array("b", [-1]) * size
+        self._slot_pieces = [None]
+        self._slot_of = {}
+        self._free_slots = []
         self._pieces = []
+        self._placements = {}
+        self._occupied = 0
+        self._full = (1 << size) - 1
 
-    def _make_list(self, Nx, Ny):
-        """Return 2D list of Fields of shape (Nx, Ny)."""
-        return [[Field((i, j)) for j in range(Ny)] for i in range(Nx)]
+    @property
+    def shape(self) -> tuple:
+        return (self._Nx, self._Ny)
 
     def __getitem__(self, indices):
-        for i, ind in enumerate(indices):
-            if ind < 0:
-                raise IndexError(f"Index {i} out of bounds, value = {ind}")
-        return super().__getitem__(indices)
+        x, y = indices
+        if not (0 <= x < self._Nx and 0 <= y < self._Ny):
+            raise IndexError(f"Index {(x, y)} out of bounds for shape {self.shape}")
+        return FieldView(self, y * self._Nx + x)
+
+    def _node_at(self, index: int) -> tuple:
+        """Return the (piece, node id) on the field at flat `index`."""
+        slot = self._slots[index]
+        if not slot:
+            return (None, None)
+        return (self._slot_pieces[slot], self._nodes[index])
+
+    def _set_node(self, index: int, piece, node):
+        """Point the field at flat `index` to `node` of `piece`."""
+        if piece is None:
+            self._slots[index] = 0
+            self._nodes[index] = -1
+            return
+
+        slot = self._slot_of.get(piece)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._slot_pieces[slot] = piece
+            else:
+                slot = len(self._slot_pieces)
+                self._slot_pieces.append(piece)
+            self._slot_of[piece] = slot
+        self._slots[index] = slot
+        self._nodes[index] = node
+
+    def _release(self, piece):
+        """Free the slot id of a piece taken off the grid."""
+        slot = self._slot_of.pop(piece, None)
+        if slot is not None:
+            self._slot_pieces[slot] = None
+            self._free_slots.append(slot)
+
+    def copy(self):
+        """Return an independent copy of the grid, sharing piece instances."""
+        other = Grid.__new__(Grid)
+        other.__dict__.update(self.__dict__)
+        other._slots = array(self._slots.typecode, self._slots)
+        other._nodes = array("b", self._nodes)
+        other._slot_pieces = list(self._slot_pieces)
+        other._slot_of = dict(self._slot_of)
+        other._free_slots = list(self._free_slots)
+        other._pieces = list(self._pieces)
+        other._placements = dict(self._placements)
+        return other
 
     def check_placement(self, piece: Piece, at: Point) -> dict:
         """Attempt to place a piece with the root node at a point.
@@ -25,77 +152,169 @@ class Grid(PointIndexed):
         Return list of piece nodes that can be successfully placed
         (either entire piece, or empty dict).
 
-        Traverses all nodes in a piece with DFS, and checks
-        each node visited against the grid.
+        Looks up the precomputed bitmask of the piece orientation and
+        tests it against the occupied-cell bitboard with a single AND.
         """
-        from_point = at
-        discovered = {}
-        path = {0: [from_point]}
-        nodes_to_place = {}
-
-        class PieceFoundException(Exception):
-            pass
-
-        class OutOfBoundsException(Exception):
-            pass
-
-        def visit(node: int) -> bool:
-            discovered[node] = True
-            for nb, direction in piece.directions[node].items():
-
-                if not discovered.get(nb, False):
-                    path[nb] = path[node] + [DIRECTIONS[direction]]
-                    path_to_nb = reduce(lambda a, b: a + b, path[nb])
-                    try:
-                        field = self[path_to_nb]
-                    except IndexError:
-                        # print("Nowhere to place piece")
-                        raise OutOfBoundsException
-                    if field.node[0] is not None:
-                        # print(f"Piece found at {path_to_nb}: {field.node[0]}")
-                        raise PieceFoundException
-                    else:
-                        nodes_to_place[nb] = path_to_nb
-                        visit(nb)
-
-        field = self[from_point]
-        if field.node[0] is not None:
-            # print(f"Piece found at {from_point}: {field.node[0]}")
+        fit = self._fit(piece.code, piece.orientation, at)
+        if fit is None:
             return {}
 
-        nodes_to_place[0] = from_point
-        try:
-            visit(0)
-            return nodes_to_place
-        except (PieceFoundException, OutOfBoundsException):
-            return {}
+        anchor, offsets, _ = fit
+        return dict(enumerate(Point(*anchor).translate(offsets)))
 
     def place(self, piece: Piece, at: Point) -> bool:
         """Attempt to place a `piece` with the root node `at` a point.
         Return whether placement was successful or not.
         """
-        nodes_to_place = self.check_placement(piece=piece, at=at)
-        if nodes_to_place:
-            for n, path_to_n in nodes_to_place.items():
-                self[path_to_n].node = (piece, n)
-            self._pieces.append(piece)
-            return True
+        fit = self._fit(piece.code, piece.orientation, at)
+        if fit is None:
+            return False
+
+        (x, y), offsets, mask = fit
+        for n, (dx, dy) in enumerate(offsets):
+            self._set_node((y + dy) * self._Nx + x + dx, piece, n)
+        self._occupied |= mask
+        self._pieces.append(piece)
+        self._placements[piece] = (x, y, offsets, mask)
+        return True
+
+    def unplace(self, piece: Piece) -> bool:
+        """Remove a placed `piece` from the grid, in O(piece size).
+        Return whether the piece was on the grid.
+        """
+        placement = self._placements.pop(piece, None)
+        if placement is None:
+            return False
+
+        x, y, offsets, mask = placement
+        for dx, dy in offsets:
+            self._set_node((y + dy) * self._Nx + x + dx, None, None)
+        self._release(piece)
+        self._occupied &= ~mask
+        if self._pieces[-1] is piece:
+            self._pieces.pop()
+        else:
+            self._pieces.remove(piece)
+        return True
+
+    def placement_mask(self, piece: Piece) -> int:
+        """Return the bitmask of fields covered by a placed `piece`,
+        or 0 if it is not on the grid."""
+        placement = self._placements.get(piece)
+        return placement[3] if placement is not None else 0
+
+    def can_place(self, code: str, at: Point, orientation: int = 1) -> bool:
+        """Return whether a piece of type `code` fits with the root node
+        `at` a point, without building a `Piece`."""
+        return self._fit(code, orientation, at) is not None
+
+    def rejection(self, code: str, at: Point, orientation: int = 1) -> str:
+        """Return why a piece of type `code` does not fit with the root node
+        `at` a point: "out-of-bounds" or "collision", or None if it fits."""
+        x, y = at
+        _, (min_dx, min_dy, max_dx, max_dy), mask = piece_bitmask(
+            code, orientation, self._Nx
+        )
+        if (
+            x + min_dx < 0
+            or y + min_dy < 0
+            or x + max_dx >= self._Nx
+            or y + max_dy >= self._Ny
+        ):
+            return "out-of-bounds"
+        if self._occupied & mask << (y + min_dy) * self._Nx + (x + min_dx):
+            return "collision"
+        return None
+
+    def iter_placements(self, code: str, orientations=None):
+        """Yield every placement of a piece of type `code` that fits
+        the grid as (x, y, orientation, bitmask), in raster order per
+        orientation. Defaults to the distinct orientations of the piece.
+
+        Placements are tested lazily, so the grid must not change
+        while iterating.
+        """
+        if orientations is None:
+            orientations = DISTINCT_ORIENTATIONS[code]
+        Nx, Ny = self._Nx, self._Ny
+        for orientation in orientations:
+            _, (min_dx, min_dy, max_dx, max_dy), mask = piece_bitmask(
+                code, orientation, Nx
+            )
+            for y in range(-min_dy, Ny - max_dy):
+                for x in range(-min_dx, Nx - max_dx):
+                    placed = mask << ((y + min_dy) * Nx + (x + min_dx))
+                    if not self._occupied & placed:
+                        yield x, y, orientation, placed
+
+    def occupancy(self):
+        """Return the occupied fields as a bool ndarray indexed [x, y].
+        Requires numpy."""
+        if np is None:
+            raise ImportError("Grid.occupancy requires numpy")
+        size = self._Nx * self._Ny
+        bits = np.frombuffer(
+            self._occupied.to_bytes((size + 7) // 8, "little"), np.uint8
+        )
+        fields = np.unpackbits(bits, bitorder="little")[:size].astype(bool)
+        return fields.reshape(self._Ny, self._Nx).T
 
-        return False
+    def feasible_anchors(self, code: str, orientation: int = 1):
+        """Return where a piece of type `code` fits with its root node, as a
+        bool ndarray indexed [x, y] like the grid. Requires numpy.
+
+        Every anchor is tested at once, by sliding the occupancy array over
+        the piece: an anchor is feasible iff none of the fields under the
+        piece's nodes is occupied, and it is False wherever the piece would
+        stick out of the grid.
+        """
+        free = ~self.occupancy()
+        offsets, (min_dx, min_dy, max_dx, max_dy), _ = piece_bitmask(
+            code, orientation, self._Nx
+        )
+        Nx, Ny = self._Nx, self._Ny
+        feasible = np.zeros((Nx, Ny), dtype=bool)
+        # Anchors that keep the whole piece on the grid
+        xs = slice(-min_dx, Nx - max_dx)
+        ys = slice(-min_dy, Ny - max_dy)
+        if xs.start >= xs.stop or ys.start >= ys.stop:
+            return feasible
+
+        window = np.ones((xs.stop - xs.start, ys.stop - ys.start), dtype=bool)
+        for dx, dy in offsets:
+            window &= free[xs.start + dx : xs.stop + dx, ys.start + dy : ys.stop + dy]
+        feasible[xs, ys] = window
+        return feasible
+
+    def _fit(self, code: str, orientation: int, at: Point):
+        """Return (anchor, node offsets, placed bitmask) if the piece fits
+        with the root node `at` a point, else None."""
+        x, y = at
+        offsets, (min_dx, min_dy, max_dx, max_dy), mask = piece_bitmask(
+            code, orientation, self._Nx
+        )
+        if (
+            x + min_dx < 0
+            or y + min_dy < 0
+            or x + max_dx >= self._Nx
+            or y + max_dy >= self._Ny
+        ):
+            return None
+
+        mask <<= (y + min_dy) * self._Nx + (x + min_dx)
+        if self._occupied & mask:
+            return None
+
+        return (x, y), offsets, mask
 
     def _is_complete(self):
         """Return True iff every field is occupied by a piece."""
-        try:
-            return self.size == sum(map(lambda piece: piece.size, self._pieces))
-        except:
-            return self.size == sum(
-                map(
-                    lambda column: sum(
-                        map(lambda field: isinstance(field.node[0], Piece), column)
-                    ),
-                    self._wrapped,
-                )
-            )
+        return self._occupied == self._full
+
+    @property
+    def occupied(self) -> int:
+        """Bitboard of occupied fields; bit `y * Nx + x` is field (x, y)."""
+        return self._occupied
 
     @property
     def pieces(self) -> list:
@@ -122,8 +341,7 @@ class Grid(PointIndexed):
         body = ""
         for y in range(R):
             for x in range(C):
-                field = self[x, y]
-                piece, _ = field.node
+                piece, _ = self._node_at(y * C + x)
                 if piece is not None:
                     if piece not in piece_ids:
                         piece_ids.append(piece)
@@ -139,8 +357,14 @@ class Grid(PointIndexed):
 
 
 class Game:
-    def __init__(self, grid_shape: tuple([int, int]), pieces: dict = None) -> None:
+    def __init__(
+        self, grid_shape: tuple([int, int]), pieces: dict = None, placed: list = None
+    ) -> None:
+        """`placed` is an optional starting position, as a list of
+        (code, x, y, orientation) out of `pieces`. These pieces are
+        fixed: `undo` never takes them back."""
         self.grid = Grid(*grid_shape)
+        self.history = []
         if pieces is None:
             self.n_pieces = self.get_default_pieces()
             self.pieces_left = self.n_pieces.copy()
@@ -148,6 +372,14 @@ class Game:
             self.n_pieces = pieces
             self.pieces_left = self.n_pieces.copy()
 
+        self.n_fixed = 0
+        for code, x, y, orientation in placed or []:
+            if self.pieces_left.get(code, 0) <= 0 or not self.place(
+                code, at=Point(x, y), orientation=orientation
+            ):
+                raise ValueError(f"Cannot place {code} at ({x}, {y})")
+        self.n_fixed = len(self.history)
+
     def get_default_pieces(self):
         """Generate library of pieces.
         Currently just hardcodes 2x Cyan pieces.
@@ -158,19 +390,33 @@ class Game:
         """Place a piece of type `code` with the root node `at` a point."""
         placed = False
         if self.pieces_left.get(code, 0) > 0:
-            piece = self._get_piece(code)(orientation=orientation)
             if check:
-                nodes = self.grid.check_placement(piece=piece, at=at)
-                placed = any(nodes)
+                placed = self.grid.can_place(code, at=at, orientation=orientation)
             else:
+                piece = self._get_piece(code)(orientation=orientation)
                 placed = self.grid.place(piece=piece, at=at)
 
-            if placed:
+            if placed and not check:
                 self.pieces_left[code] -= 1
+                self.history.append((piece, at, orientation))
         else:
             print("No more pieces remaining of type:", code)
 
         return placed
 
+    def undo(self):
+        """Take back the most recent placement.
+        Return it as (piece, point, orientation), or None if nothing
+        but the starting position was placed.
+        """
+        if len(self.history) <= self.n_fixed:
+            return None
+
+        placement = self.history.pop()
+        piece = placement[0]
+        self.grid.unplace(piece)
+        self.pieces_left[piece.code] += 1
+        return placement
+
     def _get_piece(self, code):
-        return next(filter(lambda piece: piece.code == code, COLORS))
+        return get_piece(code)
@@ -0,0 +1,204 @@
+"""Generate uniquely solvable challenge boards.
+
+Each board starts from a random tiling of the grid. Pieces are then taken
+off one at a time, in random order, as long as the pieces left in place
+still pin down a single solution, until the target number of pieces is
+left to place. Boards are generated in parallel worker processes and
+appended to a JSON Lines file as they come, one puzzle per line in the
+format of serialization.py, ready for batch.py:
+
+    python generator.py boards.jsonl --count 1000 --difficulty 6 --workers 8
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+from collections import deque
+
+from game import Game
+from pieces import COLORS
+from serialization import puzzle_to_dict
+from solvers.enumeration import count_solutions
+from solvers.heuristic import branch_min_cell, solve_brute_force
+from solvers.solution import get_solution
+
+DEFAULT_SHAPE = (11, 5)
+DEFAULT_PIECES = {piece.code: 1 for piece in COLORS}
+
+
+def _shuffled(branching, rng: random.Random):
+    """Wrap a branching strategy to try its candidates in random order."""
+
+    def branch(G: Game) -> list:
+        candidates = branching(G)
+        rng.shuffle(candidates)
+        return candidates
+
+    return branch
+
+
+def random_tiling(grid_shape: tuple, pieces: dict, rng: random.Random) -> list:
+    """Return a random solution of the empty grid, as a list of
+    (code, x, y, orientation), or None if there is none."""
+    G = Game(grid_shape, pieces=pieces)
+    solution = solve_brute_force(
+        G,
+        branching=_shuffled(branch_min_cell, rng),
+        symmetry=False,
+        decomposition=False,
+    )
+    if solution is None:
+        return None
+    return [
+        (piece.code, point.x, point.y, orientation)
+        for piece, point, orientation in get_solution(solution)
+    ]
+
+
+def is_unique(grid_shape: tuple, pieces: dict, placed: list) -> bool:
+    """Return whether the starting position `placed` has exactly one solution."""
+    G = Game(grid_shape, pieces=pieces, placed=placed)
+    return count_solutions(G, limit=2) == 1
+
+
+def generate_board(
+    grid_shape=DEFAULT_SHAPE, pieces=None, difficulty=6, seed=None
+) -> list:
+    """Return the starting position of a uniquely solvable board with
+    `difficulty` pieces left to place, as a list of (code, x, y, orientation),
+    or None if the tiling drawn from `seed` does not give one."""
+    pieces = DEFAULT_PIECES if pieces is None else pieces
+    rng = random.Random(seed)
+    placed = random_tiling(grid_shape, pieces, rng)
+    if placed is None or len(placed) < difficulty:
+        return None
+
+    order = list(placed)
+    rng.shuffle(order)
+    removed = 0
+    for placement in order:
+        if removed == difficulty:
+            break
+        kept = [p for p in placed if p != placement]
+        if is_unique(grid_shape, pieces, kept):
+            placed = kept
+            removed += 1
+    return placed if removed == difficulty else None
+
+
+def iter_boards(
+    count,
+    grid_shape=DEFAULT_SHAPE,
+    pieces=None,
+    difficulty=6,
+    workers=None,
+    seed=0,
+    attempts=None,
+):
+    """Generate up to `count` distinct boards from seeds `seed`, `seed + 1`, ...
+    on `workers` processes, giving up after `attempts` seeds if given.
+
+    Yields (seed, Game) in the order of the seeds, so the same options
+    always give the same boards.
+    """
+    pieces = DEFAULT_PIECES if pieces is None else pieces
+    workers = workers or os.cpu_count()
+    if attempts is None:
+        seeds = itertools.count(seed)
+    else:
+        seeds = iter(range(seed, seed + attempts))
+    seen = set()
+
+    with multiprocessing.Pool(workers) as pool:
+        # Only keep a few boards in flight, rather than queueing every seed
+        pending = deque()
+
+        def submit():
+            board_seed = next(seeds, None)
+            if board_seed is not None:
+                args = (grid_shape, pieces, difficulty, board_seed)
+                pending.append((board_seed, pool.apply_async(generate_board, args)))
+
+        for _ in range(2 * workers):
+            submit()
+        while pending and len(seen) < count:
+            board_seed, result = pending.popleft()
+            placed = result.get()
+            submit()
+            if placed is None:
+                continue
+            key = tuple(sorted(placed))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield board_seed, Game(grid_shape, pieces=pieces, placed=placed)
+
+
+def run_generator(output_path: str, count: int, verbose=False, **options) -> int:
+    """Append up to `count` boards to `output_path`, one JSON line each, as
+    soon as each is ready. Takes the options of `iter_boards`. Returns the
+    number of boards written."""
+    difficulty = options.get("difficulty", 6)
+    written = 0
+    with open(output_path, "a") as out:
+        for seed, G in iter_boards(count, **options):
+            board = dict(
+                puzzle_to_dict(G),
+                id=f"seed-{seed}",
+                seed=seed,
+                difficulty=difficulty,
+            )
+            out.write(json.dumps(board) + "\n")
+            out.flush()
+            written += 1
+            if verbose:
+                print(board["id"])
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="Boards are appended here, one per line")
+    parser.add_argument("--count", type=int, default=100, help="(default: 100)")
+    parser.add_argument(
+        "--difficulty",
+        type=int,
+        default=6,
+        help="Number of pieces left to place (default: 6)",
+    )
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs=2,
+        default=list(DEFAULT_SHAPE),
+        metavar=("NX", "NY"),
+        help="(default: 11 5, with every piece once)",
+    )
+    parser.add_argument(
+        "--pieces", help='Piece counts as JSON, e.g. \'{"CY": 1, "IN": 2}\''
+    )
+    parser.add_argument("--workers", type=int, help="(default: number of CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="First seed (default: 0)")
+    parser.add_argument("--attempts", type=int, help="Give up after this many seeds")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    written = run_generator(
+        args.output,
+        args.count,
+        verbose=not args.quiet,
+        grid_shape=tuple(args.shape),
+        pieces=json.loads(args.pieces) if args.pieces else None,
+        difficulty=args.difficulty,
+        workers=args.workers,
+        seed=args.seed,
+        attempts=args.attempts,
+    )
+    print(f"{written} boards written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
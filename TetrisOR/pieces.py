@@ -1,26 +1,44 @@
-from utils import Point
+import hashlib
+import json
+import os
+
+from utils import Point, UNIT_VECTORS
 
 Vector = Point
 
-U = Vector(0, -1)
-L = Vector(-1, 0)
-R = Vector(1, 0)
-D = Vector(0, 1)
-DIRECTIONS = (U, R, D, L)
+DIRECTIONS = UNIT_VECTORS
+U, R, D, L = DIRECTIONS
+
+
+PIECE_SETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "piece_sets")
 
 
 class Piece:
     code = None
     size = None
-    valid_orientations = [-4, -3, -2, 1, 1, 2, 3, 4]
+    valid_orientations = [-4, -3, -2, -1, 1, 2, 3, 4]
     spans = None
+    # (x, y) of every node in the base orientation; node 0 is the root
+    cells = None
 
     def __init__(self, orientation=1):
-        self.directions = None
-        self.assign_neighbours()
-        self.size = len(self.directions)
-        self.orientation = 1
-        self.set_orientation(orientation)
+        directions = _ORIENTED_DIRECTIONS.get((self.code, orientation))
+        if directions is not None:
+            # Directions dicts are never mutated in place, so can be shared
+            self.directions = directions
+            self.size = len(directions)
+            self.orientation = orientation
+        else:
+            self.directions = None
+            self.assign_neighbours()
+            self.size = len(self.directions)
+            self.orientation = 1
+            self.set_orientation(orientation)
+
+    def __reduce__(self):
+        # Piece types defined from data are not module attributes, so are
+        # pickled by their registered code instead
+        return _unpickle_piece, (self.code,), self.__dict__
 
     def rotate(self, turn):
         """Adjust nodes according to direction of turn.
@@ -53,9 +71,9 @@ class Piece:
         self.directions = new_directions
         return self
 
-    def assign_neighbours():
+    def assign_neighbours(self):
         """Assign directions of neighbours according to base orientation"""
-        pass
+        self.directions = directions_from_cells(self.cells)
 
     def set_orientation(self, orientation):
         """Rotate and/or flip piece to the desired orientation.
@@ -108,6 +126,22 @@ class Piece:
         self.orientation = orientation
         return self
 
+    def node_offsets(self) -> dict:
+        """Return the (dx, dy) offset of every node from the root node 0,
+        in the piece's current orientation."""
+        offsets = {0: (0, 0)}
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            x, y = offsets[node]
+            for nb, direction in self.directions[node].items():
+                if nb not in offsets:
+                    step = DIRECTIONS[direction]
+                    offsets[nb] = (x + step.x, y + step.y)
+                    stack.append(nb)
+
+        return offsets
+
     def print_directions(self):
         """Replace integer directions with letters for more readability."""
         to_print = {node: {} for node in self.directions}
@@ -119,267 +153,241 @@ class Piece:
         print(to_print)
 
 
-class Cyan(Piece):
-    """Base orientation:
-    []
-    [][]
-    """
-
-    code = "CY"
-    size = 3
-    # valid_orientations = [-4, -3, -2, -1, 1, 2, 3, 4]
-    spans = [(2, 2)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {0: {1: 2}, 1: {0: 0, 2: 1}, 2: {1: 3}}
-
-
-class Orange(Piece):
-    """Base orientation:
-      [][]
-    [][]
-      []
-    """
-
-    code = "OR"
-    size = 5
-    # valid_orientations = [-4, -3, -2, -1, 1, 2, 3, 4]
-    spans = [(3, 3), (3, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 3},
-            1: {0: 1, 2: 2},
-            2: {1: 0, 3: 3, 4: 2},
-            3: {2: 1},
-            4: {2: 0},
-        }
-
-
-class Indigo(Piece):
-    """Base orientation:
-    []
-    [][][]
-    """
-
-    code = "IN"
-    size = 4
-    # valid_orientations = [-4, -3, -2, -1, 1, 2, 3, 4]
-    spans = [(3, 2), (2, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {0: {1: 2}, 1: {0: 0, 2: 1}, 2: {1: 3, 3: 1}, 3: {2: 3}}
-
-
-class Maroon(Piece):
-    """Base orientation:
-    [][]
-      [][]
-    """
-
-    code = "MR"
-    size = 4
-    # valid_orientations = [-4, -3, -2, 1, 1, 2, 3, 4]
-    spans = [(3, 2), (2, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {0: {1: 1}, 1: {0: 3, 2: 2}, 2: {1: 0, 3: 1}, 3: {2: 3}}
-
-
-class Teal(Piece):
-    """Base orientation:
-      []
-    [][][]
-    """
-
-    code = "TE"
-    size = 4
-    # valid_orientations = [1, 2, 3, 4]
-    spans = [(3, 2), (2, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {0: {1: 1}, 1: {0: 3, 2: 0, 3: 1}, 2: {1: 2}, 3: {1: 3}}
-
-
-class AzureBlue(Piece):
-    """Base orientation:
-    []
-    []
-    [][][]
-    """
-
-    code = "AB"
-    size = 5
-    spans = [(3, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 2},
-            1: {0: 0, 2: 2},
-            2: {1: 0, 3: 1},
-            3: {2: 3, 4: 1},
-            4: {3: 3},
-        }
-
-
-class EmeraldGreen(Piece):
-    """Base orientation:
-    []  []
-    [][][]
+def directions_from_cells(cells: list) -> dict:
+    """Return the `Piece.directions` of a piece whose nodes are at `cells`,
+    linking every pair of orthogonally adjacent nodes."""
+    index = {tuple(cell): n for n, cell in enumerate(cells)}
+    directions = {n: {} for n in range(len(cells))}
+    for n, (x, y) in enumerate(cells):
+        for direction, step in enumerate(DIRECTIONS):
+            neighbour = index.get((x + step.x, y + step.y))
+            if neighbour is not None:
+                directions[n][neighbour] = direction
+    return directions
+
+
+def parse_shape(lines: list) -> list:
+    """Return the (x, y) cells of a piece drawn in ASCII, one string per
+    row, in raster order. Spaces and dots are empty, anything else is
+    part of the piece; the first cell becomes the root node."""
+    return [
+        (x, y)
+        for y, line in enumerate(lines)
+        for x, char in enumerate(line)
+        if char not in " ."
+    ]
+
+
+def draw_cells(cells: list) -> str:
+    """Draw cells in the [] notation of the piece docstrings."""
+    min_x = min(x for x, _ in cells)
+    min_y = min(y for _, y in cells)
+    filled = {(x - min_x, y - min_y) for x, y in cells}
+    width = max(x for x, _ in filled) + 1
+    height = max(y for _, y in filled) + 1
+    return "\n".join(
+        "".join("[]" if (x, y) in filled else "  " for x in range(width)).rstrip()
+        for y in range(height)
+    )
+
+
+def define_piece(code: str, cells: list, name: str = None) -> type:
+    """Return a new `Piece` subclass with nodes at `cells`, in node order.
+
+    Cells are taken relative to the first one, which becomes the root
+    node 0. The piece must be a polyomino: no repeated cells, and every
+    cell connected to the others through its edges.
     """
-
-    code = "EG"
-    size = 5
-    spans = [(3, 2), (2, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 2},
-            1: {0: 0, 2: 1},
-            2: {1: 3, 3: 1},
-            3: {2: 3, 4: 0},
-            4: {3: 2},
-        }
-
-
-class Magenta(Piece):
-    """Base orientation:
-    [][]
-      [][][]
+    cells = [tuple(cell) for cell in cells]
+    if not cells:
+        raise ValueError(f"Piece {code} has no cells")
+    if len(set(cells)) != len(cells):
+        raise ValueError(f"Piece {code} has repeated cells")
+    x0, y0 = cells[0]
+    cells = tuple((x - x0, y - y0) for x, y in cells)
+
+    directions = directions_from_cells(cells)
+    reached = {0}
+    stack = [0]
+    while stack:
+        for neighbour in directions[stack.pop()]:
+            if neighbour not in reached:
+                reached.add(neighbour)
+                stack.append(neighbour)
+    if len(reached) != len(cells):
+        raise ValueError(f"Piece {code} is not connected")
+
+    doc = "Base orientation:\n" + draw_cells(cells)
+    return type(
+        name or code,
+        (Piece,),
+        {"code": code, "size": len(cells), "cells": cells, "__doc__": doc},
+    )
+
+
+def load_piece_set(path: str) -> list:
+    """Load, register and return the pieces defined in a JSON file:
+
+        {"name": ..., "pieces": [{"code": "CY", "name": "Cyan",
+                                  "cells": [[0, 0], [0, 1], [1, 1]]},
+                                 {"code": "X", "shape": [".#.", "###", ".#."]}]}
+
+    Each piece gives either its `cells` in node order, or its `shape` in
+    ASCII (see `parse_shape`), and an optional class `name`.
     """
+    with open(path) as f:
+        piece_set = json.load(f)
+    return load_pieces(piece_set["pieces"])
+
+
+def load_pieces(definitions: list) -> list:
+    """Define, register and return pieces from definitions in the format
+    of a piece set file (see `load_piece_set`)."""
+    pieces = []
+    for definition in definitions:
+        code = definition["code"]
+        if "cells" in definition:
+            cells = definition["cells"]
+        else:
+            cells = parse_shape(definition["shape"])
+        pieces.append(define_piece(code, cells, name=definition.get("name")))
+    return register(pieces)
 
-    code = "MA"
-    size = 5
-    spans = [(2, 4), (4, 2)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 1},
-            1: {0: 3, 2: 2},
-            2: {1: 0, 3: 1},
-            3: {2: 3, 4: 1},
-            4: {3: 3},
-        }
 
+def _build_orientation_table(pieces):
+    """Trace every valid orientation of every piece once.
 
-class MintGreen(Piece):
-    """Base orientation:
-    [][]
-    [][][]
+    Returns (oriented directions, node offsets, distinct orientations):
+    - oriented directions maps (code, orientation) to `Piece.directions`
+    - node offsets maps code to {orientation: tuple of (dx, dy) per node},
+      relative to the root node 0
+    - distinct orientations maps code to the orientations whose footprints
+      differ from every earlier orientation, up to translation
     """
-
-    code = "MI"
-    size = 5
-    spans = [(3, 2), (2, 3)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 1, 2: 2},
-            1: {0: 3, 3: 2},
-            2: {0: 0, 3: 1},
-            3: {2: 3, 1: 0, 4: 1},
-            4: {3: 3},
-        }
-
-
-class Red(Piece):
-    """Base orientation:
-    []
-    [][][][]
+    directions = {}
+    offsets = {}
+    distinct = {}
+    for piece in pieces:
+        offsets[piece.code] = {}
+        distinct[piece.code] = []
+        footprints = set()
+        for orientation in piece.valid_orientations:
+            if orientation in offsets[piece.code]:
+                continue
+
+            oriented = piece(orientation=orientation)
+            directions[piece.code, orientation] = oriented.directions
+            node_offsets = oriented.node_offsets()
+            cells = tuple(node_offsets[n] for n in range(len(node_offsets)))
+            offsets[piece.code][orientation] = cells
+
+            min_x = min(dx for dx, _ in cells)
+            min_y = min(dy for _, dy in cells)
+            footprint = frozenset((dx - min_x, dy - min_y) for dx, dy in cells)
+            if footprint not in footprints:
+                footprints.add(footprint)
+                distinct[piece.code].append(orientation)
+
+    return directions, offsets, distinct
+
+
+# Every registered piece type by code, and its orientations
+PIECES = {}
+_ORIENTED_DIRECTIONS = {}
+ORIENTATIONS = {}
+DISTINCT_ORIENTATIONS = {}
+_fingerprint = None
+
+
+def register(pieces: list) -> list:
+    """Make piece types available to games and solvers by their code.
+
+    Derives their orientations and spans. Registering a piece with the
+    same code and cells as one already registered returns the existing
+    type, so loading a piece set twice is harmless. Returns the
+    registered types.
     """
-
-    code = "RE"
-    size = 5
-    spans = [(2, 4), (4, 2)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
-
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 2},
-            1: {0: 0, 2: 1},
-            2: {1: 3, 3: 1},
-            3: {2: 3, 4: 1},
-            4: {3: 3},
+    global _fingerprint
+    registered = []
+    new = []
+    for piece in pieces:
+        existing = PIECES.get(piece.code)
+        if existing is None:
+            new.append(piece)
+            registered.append(piece)
+        elif existing is piece or existing.cells == piece.cells:
+            registered.append(existing)
+        else:
+            raise ValueError(f"Piece code {piece.code} is already in use")
+
+    directions, offsets, distinct = _build_orientation_table(new)
+    _ORIENTED_DIRECTIONS.update(directions)
+    ORIENTATIONS.update(offsets)
+    DISTINCT_ORIENTATIONS.update(distinct)
+    for piece in new:
+        spans = set()
+        for orientation in distinct[piece.code]:
+            cells = offsets[piece.code][orientation]
+            xs = [dx for dx, _ in cells]
+            ys = [dy for _, dy in cells]
+            spans.add((max(xs) - min(xs) + 1, max(ys) - min(ys) + 1))
+        piece.spans = sorted(spans)
+        PIECES[piece.code] = piece
+
+    if new:
+        _fingerprint = None
+    return registered
+
+
+def get_piece(code: str) -> type:
+    """Return the registered piece type with `code`."""
+    try:
+        return PIECES[code]
+    except KeyError:
+        raise ValueError(f"Unknown piece: {code}")
+
+
+def piece_definitions(codes) -> list:
+    """Return the definitions of the registered pieces with `codes`, for
+    `load_pieces` to register them again, e.g. in another process."""
+    return [
+        {
+            "code": code,
+            "name": get_piece(code).__name__,
+            "cells": [list(cell) for cell in get_piece(code).cells],
         }
+        for code in codes
+    ]
 
 
-class Wine(Piece):
-    """Base orientation:
-    []
-    [][]
-      [][]
-    """
+def _unpickle_piece(code: str) -> "Piece":
+    piece = get_piece(code)
+    return piece.__new__(piece)
 
-    code = "WI"
-    size = 5
-    spans = [(3, 3)]
 
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
+def piece_set_fingerprint() -> str:
+    """Return a short hash of the orientations of every registered piece,
+    which changes whenever a piece is registered."""
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = hashlib.sha1(
+            repr((ORIENTATIONS, DISTINCT_ORIENTATIONS)).encode()
+        ).hexdigest()[:12]
+    return _fingerprint
 
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 2},
-            1: {0: 0, 2: 1},
-            2: {1: 3, 3: 2},
-            3: {2: 0, 4: 1},
-            4: {3: 3},
-        }
-
-
-class Yellow(Piece):
-    """Base orientation:
-      []
-    [][][][]
-    """
-
-    code = "YE"
-    size = 5
-    spans = [(2, 4), (4, 2)]
-
-    def __init__(self, orientation=1):
-        super().__init__(orientation=orientation)
 
-    def assign_neighbours(self):
-        self.directions = {
-            0: {1: 1},
-            1: {0: 3, 2: 0, 3: 1},
-            2: {1: 2},
-            3: {1: 3, 4: 1},
-            4: {3: 3},
-        }
+def orientation_offsets(code: str, orientation: int) -> tuple:
+    """Return the (dx, dy) offsets of every node of piece `code`
+    in `orientation`, relative to the root node."""
+    try:
+        return ORIENTATIONS[code][orientation]
+    except KeyError:
+        raise ValueError(f"Unknown piece orientation: {code}, {orientation}")
 
 
-COLORS = [
+# The pieces of the IQ Puzzler, registered by default
+COLORS = load_piece_set(os.path.join(PIECE_SETS_DIR, "iq_puzzler.json"))
+(
     Cyan,
     Indigo,
     Maroon,
@@ -392,18 +400,4 @@ COLORS = [
     Wine,
     Yellow,
     Orange,
-]
-
-# if __name__ == "__main__":
-
-#     from game import Game
-#     from itertools import product
-
-#     for piece in COLORS:
-#             g = Game(grid_shape=(4, 4), pieces={piece.code: 1})
-#             n_cols, n_rows = g.grid.shape
-#             for y, x, ori in product(range(n_rows), range(n_cols), piece.valid_orientations):
-#                 placed = g.place(piece.code, at=Point(x, y))
-#                 if placed:
-#                     break
-#             print(g.grid)
+) = COLORS
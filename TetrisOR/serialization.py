@@ -0,0 +1,268 @@
+"""Saving and loading puzzles and their solutions.
+
+A puzzle is stored as JSON:
+
+    {"format": "tetrisor-puzzle", "version": 1, "grid_shape": [11, 5],
+     "pieces": {"CY": 1, ...}, "placed": [["CY", 1, 1, -4], ...]}
+
+where `pieces` counts every piece of the puzzle, including the ones in
+`placed`, which are on the grid from the start.
+
+Solutions are lists of (code, x, y, orientation), one per placement made
+by the solver. They are stored in one of two formats, picked by the file
+extension:
+- .jsonl: a header line with the puzzle, then one JSON list per solution
+- anything else: a binary file with the puzzle as a JSON header, then one
+  record per solution, storing each placement as its piece code index and
+  its bitmask over the grid
+
+Both formats are append-only and written one whole solution at a time, so
+a run that crashed can reopen its file, drop a partial last record, and
+resume after the solutions already saved.
+"""
+
+import json
+import os
+import struct
+
+from game import Game, piece_bitmask
+from pieces import DISTINCT_ORIENTATIONS
+
+PUZZLE_FORMAT = "tetrisor-puzzle"
+SOLUTIONS_FORMAT = "tetrisor-solutions"
+VERSION = 1
+MAGIC = b"TORS"
+
+# Magic, version and length of the JSON header
+_HEADER = struct.Struct("<4sBI")
+# Length of a solution record
+_RECORD = struct.Struct("<I")
+
+
+def puzzle_to_dict(G: Game) -> dict:
+    """Return the puzzle of a game, with every piece placed so far."""
+    return {
+        "format": PUZZLE_FORMAT,
+        "version": VERSION,
+        "grid_shape": list(G.grid.shape),
+        "pieces": dict(G.n_pieces),
+        "placed": [
+            [piece.code, point[0], point[1], orientation]
+            for piece, point, orientation in G.history
+        ],
+    }
+
+
+def puzzle_from_dict(puzzle: dict) -> Game:
+    """Build the game for a puzzle, with its pieces placed."""
+    return Game(
+        grid_shape=tuple(puzzle["grid_shape"]),
+        pieces=dict(puzzle["pieces"]),
+        placed=puzzle.get("placed", []),
+    )
+
+
+def save_puzzle(G: Game, path: str):
+    with open(path, "w") as f:
+        json.dump(puzzle_to_dict(G), f, indent=2)
+
+
+def load_puzzle(path: str) -> Game:
+    with open(path) as f:
+        puzzle = json.load(f)
+    if puzzle.get("format") != PUZZLE_FORMAT:
+        raise ValueError(f"Not a puzzle file: {path}")
+    return puzzle_from_dict(puzzle)
+
+
+def _is_binary(path: str) -> bool:
+    return not path.endswith(".jsonl")
+
+
+def _code_bytes(codes: list) -> int:
+    """Return the number of bytes of an index into `codes`."""
+    return max(1, ((len(codes) - 1).bit_length() + 7) // 8)
+
+
+def _placement_mask(code: str, x: int, y: int, orientation: int, width: int) -> int:
+    _, (min_dx, min_dy, _, _), mask = piece_bitmask(code, orientation, width)
+    return mask << (y + min_dy) * width + (x + min_dx)
+
+
+def _placement_from_mask(code: str, mask: int, shape: tuple) -> tuple:
+    """Return the (code, x, y, orientation) covering exactly `mask`."""
+    Nx, _ = shape
+    low = (mask & -mask).bit_length() - 1
+    for orientation in DISTINCT_ORIENTATIONS[code]:
+        _, (min_dx, min_dy, max_dx, _), aligned = piece_bitmask(code, orientation, Nx)
+        shift = low - ((aligned & -aligned).bit_length() - 1)
+        if shift < 0 or aligned << shift != mask:
+            continue
+        x0, y0 = shift % Nx, shift // Nx
+        if x0 + max_dx - min_dx < Nx:
+            return (code, x0 - min_dx, y0 - min_dy, orientation)
+    raise ValueError(f"Bitmask {mask:#x} is not a placement of {code}")
+
+
+class SolutionWriter:
+    """Append solutions of a puzzle to a file, one whole record at a time.
+
+    Opening an existing file checks that it holds solutions of the same
+    puzzle, drops any partial record at its end, and sets `count` to the
+    number of solutions already saved. A run can then resume by skipping
+    that many solutions of a deterministic enumeration:
+
+        with SolutionWriter(path, G) as writer:
+            for solution in islice(iter_solutions(G), writer.count, None):
+                writer.append(solution)
+    """
+
+    def __init__(self, path: str, G: Game):
+        self.path = path
+        self.puzzle = puzzle_to_dict(G)
+        self.shape = G.grid.shape
+        self.codes = sorted(G.n_pieces)
+        self._code_index = {code: i for i, code in enumerate(self.codes)}
+        self._code_bytes = _code_bytes(self.codes)
+        self._binary = _is_binary(path)
+        self._mask_bytes = (self.shape[0] * self.shape[1] + 7) // 8
+
+        self.count = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            header, records, end = _scan(path)
+            if header["puzzle"] != self.puzzle:
+                raise ValueError(f"File holds solutions of another puzzle: {path}")
+            self.count = records
+            self._file = open(path, "r+b")
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(self._header())
+        self._file.flush()
+
+    def _header(self) -> bytes:
+        header = {
+            "format": SOLUTIONS_FORMAT,
+            "version": VERSION,
+            "puzzle": self.puzzle,
+            "codes": self.codes,
+        }
+        if not self._binary:
+            return (json.dumps(header) + "\n").encode()
+        data = json.dumps(header).encode()
+        return _HEADER.pack(MAGIC, VERSION, len(data)) + data
+
+    def _encode(self, solution: list) -> bytes:
+        if not self._binary:
+            return (json.dumps([list(p) for p in solution]) + "\n").encode()
+        Nx = self.shape[0]
+        payload = b"".join(
+            self._code_index[code].to_bytes(self._code_bytes, "little")
+            + _placement_mask(code, x, y, orientation, Nx).to_bytes(
+                self._mask_bytes, "little"
+            )
+            for code, x, y, orientation in solution
+        )
+        return _RECORD.pack(len(payload)) + payload
+
+    def append(self, solution: list):
+        """Write one solution, as a list of (code, x, y, orientation)."""
+        self._file.write(self._encode(solution))
+        self.count += 1
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_header(f, path: str) -> dict:
+    if _is_binary(path):
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"Not a solutions file: {path}")
+        magic, version, length = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"Not a solutions file: {path}")
+        header = json.loads(f.read(length))
+    else:
+        header = json.loads(f.readline())
+    if header.get("format") != SOLUTIONS_FORMAT:
+        raise ValueError(f"Not a solutions file: {path}")
+    if header["version"] > VERSION:
+        raise ValueError(f"Unsupported version {header['version']}: {path}")
+    return header
+
+
+def _iter_records(f, path: str, header: dict):
+    """Yield (solution, end offset) for every complete record."""
+    if not _is_binary(path):
+        for line in iter(f.readline, b""):
+            if not line.endswith(b"\n"):
+                return
+            yield [tuple(p) for p in json.loads(line)], f.tell()
+        return
+
+    codes = header["codes"]
+    shape = tuple(header["puzzle"]["grid_shape"])
+    code_bytes = _code_bytes(codes)
+    size = code_bytes + (shape[0] * shape[1] + 7) // 8
+    while True:
+        raw = f.read(_RECORD.size)
+        if len(raw) < _RECORD.size:
+            return
+        (length,) = _RECORD.unpack(raw)
+        payload = f.read(length)
+        if len(payload) < length:
+            return
+        yield [
+            _placement_from_mask(
+                codes[int.from_bytes(payload[i : i + code_bytes], "little")],
+                int.from_bytes(payload[i + code_bytes : i + size], "little"),
+                shape,
+            )
+            for i in range(0, length, size)
+        ], f.tell()
+
+
+def _scan(path: str) -> tuple:
+    """Return (header, number of complete records, offset after the last one)."""
+    with open(path, "rb") as f:
+        header = _read_header(f, path)
+        records, end = 0, f.tell()
+        for _, end in _iter_records(f, path, header):
+            records += 1
+    return header, records, end
+
+
+def load_solutions(path: str):
+    """Lazily yield every complete solution saved in a file,
+    as a list of (code, x, y, orientation)."""
+    with open(path, "rb") as f:
+        header = _read_header(f, path)
+        for solution, _ in _iter_records(f, path, header):
+            yield solution
+
+
+def load_solutions_puzzle(path: str) -> Game:
+    """Return the game that the solutions in a file belong to."""
+    with open(path, "rb") as f:
+        return puzzle_from_dict(_read_header(f, path)["puzzle"])
+
+
+def save_solutions(path: str, G: Game, solutions) -> int:
+    """Append every solution from an iterable to a file, creating it
+    if needed. Returns the number of solutions in the file."""
+    with SolutionWriter(path, G) as writer:
+        for solution in solutions:
+            writer.append(solution)
+        return writer.count
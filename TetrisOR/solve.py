@@ -0,0 +1,87 @@
+"""Solve a saved puzzle with the heuristic solver.
+
+Long searches can be checkpointed and resumed after a crash, or after
+being interrupted with Ctrl-C or SIGTERM:
+
+    python solve.py puzzle.json --checkpoint run.ckpt --every-seconds 60
+    python solve.py puzzle.json --checkpoint run.ckpt --resume
+"""
+
+import argparse
+import signal
+import sys
+
+from serialization import load_puzzle
+from solvers.checkpoint import Checkpoint
+from solvers.heuristic import BRANCHING_STRATEGIES, solve_brute_force
+from solvers.solution import get_solution
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("puzzle", help="Puzzle file, see serialization.py")
+    parser.add_argument(
+        "--branching",
+        choices=list(BRANCHING_STRATEGIES),
+        default="first-piece",
+        help="Branching strategy (default: first-piece)",
+    )
+    parser.add_argument("--checkpoint", help="Save the search position to this file")
+    parser.add_argument("--every-nodes", type=int, help="Checkpoint every N nodes")
+    parser.add_argument(
+        "--every-seconds", type=float, default=60, help="Checkpoint every T seconds"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue from the checkpoint file"
+    )
+    args = parser.parse_args(argv)
+
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(
+            args.checkpoint,
+            every_nodes=args.every_nodes,
+            every_seconds=args.every_seconds,
+        )
+        if args.resume and checkpoint.load() is None:
+            parser.error(f"No checkpoint to resume from: {args.checkpoint}")
+        if not args.resume:
+            checkpoint.clear()
+    elif args.resume:
+        parser.error("--resume requires --checkpoint")
+
+    interrupted = False
+
+    def interrupt(signum, frame):
+        nonlocal interrupted
+        interrupted = True
+
+    signal.signal(signal.SIGINT, interrupt)
+    signal.signal(signal.SIGTERM, interrupt)
+
+    G = load_puzzle(args.puzzle)
+    solution = solve_brute_force(
+        G,
+        branching=args.branching,
+        stop=lambda: interrupted,
+        checkpoint=checkpoint,
+    )
+
+    if interrupted:
+        if checkpoint is not None:
+            print(f"Interrupted, position saved to {args.checkpoint}")
+        else:
+            print("Interrupted")
+        return 1
+    if solution is None:
+        print("No solution found")
+        return 1
+
+    for piece, point, orientation in get_solution(solution):
+        print(piece.code, point.x, point.y, orientation)
+    print(G.grid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import time
+
+CHECKPOINT_FORMAT = "tetrisor-checkpoint"
+VERSION = 1
+
+
+class Checkpoint:
+    """Periodically saved position of a depth-first search.
+
+    The position is the stack of frames from the root of the search to
+    the node being expanded, one per placement made by the solver, as
+    [candidate index, code, x, y, orientation]. The candidate index is
+    the position of the placement among those picked by the branching
+    strategy, so every candidate before it has been fully explored.
+
+    A checkpoint is saved every `every_nodes` nodes or `every_seconds`
+    seconds, whichever comes first, and written atomically so that a
+    crash never leaves a partial file behind.
+    """
+
+    def __init__(self, path: str, every_nodes: int = None, every_seconds: float = None):
+        self.path = path
+        self.every_nodes = every_nodes
+        self.every_seconds = every_seconds
+        self._last_nodes = 0
+        self._last_time = time.monotonic()
+
+    def due(self, nodes: int) -> bool:
+        """Return whether a checkpoint should be saved after `nodes` nodes."""
+        if (
+            self.every_nodes is not None
+            and nodes - self._last_nodes >= self.every_nodes
+        ):
+            return True
+        return (
+            self.every_seconds is not None
+            and time.monotonic() - self._last_time >= self.every_seconds
+        )
+
+    def save(self, state: dict, nodes: int = 0):
+        """Atomically write the search `state` to the checkpoint file."""
+        state = dict(state, format=CHECKPOINT_FORMAT, version=VERSION)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._last_nodes = nodes
+        self._last_time = time.monotonic()
+
+    def load(self) -> dict:
+        """Return the saved search state, or None if there is none."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"Not a checkpoint file: {self.path}")
+        self._last_nodes = state.get("nodes", 0)
+        return state
+
+    def clear(self):
+        """Remove the checkpoint file, once the search has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
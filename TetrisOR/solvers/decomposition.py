@@ -0,0 +1,189 @@
+from game import Game, Grid, piece_bitmask
+from pieces import get_piece
+from solvers.placement_index import get_placement_index
+from solvers.pruning import EmptyRegions, Region
+
+
+def sub_multisets(pieces: tuple, size: int):
+    """Yield every (part, rest) split of a piece multiset, given as a sorted
+    tuple of (code, count), such that the pieces in `part` cover exactly
+    `size` fields. Both are sorted tuples of (code, count) as well."""
+
+    def split(i, size):
+        if size == 0:
+            yield (), pieces[i:]
+            return
+        if i == len(pieces):
+            return
+        code, n = pieces[i]
+        piece_size = get_piece(code).size
+        for k in range(min(n, size // piece_size), -1, -1):
+            for part, rest in split(i + 1, size - k * piece_size):
+                yield (
+                    ((code, k),) + part if k else part,
+                    ((code, n - k),) + rest if k < n else rest,
+                )
+
+    return split(0, size)
+
+
+def _size(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _take(pieces: tuple, code: str) -> tuple:
+    """Return the multiset `pieces` with one `code` less."""
+    return tuple(
+        (c, n - 1 if c == code else n) for c, n in pieces if c != code or n > 1
+    )
+
+
+def _lowest_field(index, occupied: int, pieces_left: dict) -> list:
+    """Every placement covering the lowest empty field."""
+    empty = index.full & ~occupied
+    cell = empty & -empty
+    return [
+        (code, x, y, ori)
+        for code in pieces_left
+        for x, y, ori, _ in index.fitting_cell(code, cell, occupied)
+    ]
+
+
+class RegionSolver:
+    """Fill the empty fields of a game one connected region at a time.
+
+    Once placements split the empty fields into several regions, they can
+    be solved independently, over every way of sharing the remaining
+    pieces out between them. Within a region, the candidates picked by
+    `branching` are tried in turn, and the regions left behind are split
+    up again. `branching` is a function of the placement index, the
+    occupied fields and the pieces left, returning a list of (code, x, y,
+    orientation); by default, the lowest empty field is filled with every
+    piece that fits.
+
+    Every (region shape, piece multiset) solved is memoized with its
+    solution, or None if it has none. Shapes are normalized to the top-left
+    of their bounding box, so the same hole anywhere on the board, or in
+    another branch of the search, is only solved once. The memo keeps the
+    `memo_size` most recently used entries.
+    """
+
+    def __init__(self, shape: tuple, stats=None, branching=None, memo_size=100000):
+        self._index = get_placement_index(shape)
+        self._width = shape[0]
+        self._full = self._index.full
+        self._regions = EmptyRegions(Grid(*shape))
+        self._branching = branching or _lowest_field
+        self._rank = {}
+        self.stats = stats
+        self.memo = {}
+        self.memo_size = memo_size
+        self.hits = 0
+        self.stopped = False
+        # (position, stack, result) of a stopped solve
+        self._suspended = None
+
+    def solve(self, G: Game, depth: int = 0, stop=None) -> list:
+        """Return placements as (code, x, y, orientation) filling every empty
+        field of the game with its remaining pieces, or None if there are
+        none. If given, `stats` counts nodes from `depth` on.
+
+        If given, `stop` is called before each step, and the solve gives up
+        (returning None, with `stopped` set) once it returns True. Solving
+        the same position again continues where it stopped.
+        """
+        empty = G.grid._full & ~G.grid.occupied
+        pieces = tuple(sorted((c, n) for c, n in G.pieces_left.items() if n > 0))
+        # Branching sees the pieces left in the order of the game
+        self._rank = {code: i for i, code in enumerate(G.pieces_left)}
+        key = (empty, pieces, depth)
+        if self._suspended is not None and self._suspended[0] == key:
+            _, stack, result = self._suspended
+        else:
+            stack, result = [self._solve(empty, pieces, depth)], None
+        self._suspended = None
+        return self._run(key, stack, result, stop)
+
+    def _run(self, key: tuple, stack: list, result, stop=None) -> list:
+        """Evaluate calls of `_solve`, `_split` and `_solve_region` on an
+        explicit stack, so the depth is not limited by the recursion limit.
+
+        Each of these is a generator that yields the calls it depends on,
+        is sent back their results, and returns its own. `result` is sent
+        to the call on top of the stack first.
+        """
+        self.stopped = False
+        while stack:
+            if stop is not None and stop():
+                self.stopped = True
+                self._suspended = (key, stack, result)
+                return None
+            try:
+                call = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                result = done.value
+            else:
+                stack.append(call)
+                result = None
+        return result
+
+    def _solve(self, empty: int, pieces: tuple, depth: int):
+        """Fill `empty` with some of `pieces`, region by region."""
+        regions = sorted(self._regions.components(empty), key=_size)
+        if len(regions) == 1:
+            return (yield self._solve_region(regions[0], pieces, depth))
+        return (yield self._split(regions, pieces, depth))
+
+    def _split(self, regions: list, pieces: tuple, depth: int):
+        """Share `pieces` out between `regions`, each filled exactly."""
+        if not regions:
+            return []
+        region, others = regions[0], regions[1:]
+        for part, rest in sub_multisets(pieces, _size(region)):
+            solution = yield self._solve_region(region, part, depth)
+            if solution is None:
+                continue
+            remainder = yield self._split(others, rest, depth + len(solution))
+            if remainder is not None:
+                return solution + remainder
+        return None
+
+    def _solve_region(self, region: int, pieces: tuple, depth: int):
+        """Fill the connected `region` with some of `pieces`, memoized."""
+        min_x, min_y, _, _ = Region(region, self._width)._bounds
+        key = (region >> min_y * self._width + min_x, pieces)
+        if key in self.memo:
+            self.hits += 1
+            if self.stats is not None:
+                self.stats.prune("region-memo")
+            solution = self.memo[key] = self.memo.pop(key)
+            if solution is None:
+                return None
+            return [(c, x + min_x, y + min_y, o) for c, x, y, o in solution]
+
+        if self.stats is not None:
+            self.stats.node(depth)
+        solution = None
+        if sum(get_piece(c).size * n for c, n in pieces) >= _size(region):
+            pieces_left = dict(sorted(pieces, key=lambda p: self._rank.get(p[0], 0)))
+            candidates = self._branching(self._index, self._full & ~region, pieces_left)
+            for code, x, y, ori in candidates:
+                _, (min_dx, min_dy, _, _), mask = piece_bitmask(code, ori, self._width)
+                mask <<= (y + min_dy) * self._width + (x + min_dx)
+                rest = region & ~mask
+                remainder = (
+                    (yield self._solve(rest, _take(pieces, code), depth + 1))
+                    if rest
+                    else []
+                )
+                if remainder is not None:
+                    solution = [(code, x, y, ori)] + remainder
+                    break
+
+        while len(self.memo) >= self.memo_size:
+            del self.memo[next(iter(self.memo))]
+        self.memo[key] = None
+        if solution is not None:
+            self.memo[key] = [(c, x - min_x, y - min_y, o) for c, x, y, o in solution]
+        return solution
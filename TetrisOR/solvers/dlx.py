@@ -0,0 +1,305 @@
+from game import Game
+from utils import Point
+from solvers.solution import build_chain, get_solution
+from solvers.symmetry import board_symmetries, is_canonical, symmetry_breaking_piece
+
+
+class ExactCover:
+    """Exact-cover matrix stored as Knuth's dancing links.
+
+    Nodes are integer indices into parallel lists of left, right, up
+    and down links, so covering and uncovering a column is pure list
+    assignment. Index 0 is the root header; column headers follow.
+
+    Primary columns must be covered exactly once. Secondary columns
+    may be covered at most `capacity` times, which lets a single column
+    stand for several identical pieces without enumerating every
+    permutation of them.
+    """
+
+    def __init__(self, n_primary: int, capacities: list):
+        n_columns = n_primary + len(capacities)
+        self.n_primary = n_primary
+        self.L = [i - 1 for i in range(n_columns + 1)]
+        self.R = [i + 1 for i in range(n_columns + 1)]
+        self.U = list(range(n_columns + 1))
+        self.D = list(range(n_columns + 1))
+        self.C = list(range(n_columns + 1))
+        self.S = [0] * (n_columns + 1)
+        self.row_of = [-1] * (n_columns + 1)
+        self.rows = []
+        self.remaining = [None] * (n_primary + 1) + list(capacities)
+
+        # Only primary columns are linked into the header list
+        self.L[0] = n_primary
+        self.R[n_primary] = 0
+        for c in range(n_primary + 1, n_columns + 1):
+            self.L[c] = self.R[c] = c
+
+    def add_row(self, columns: list, data=None):
+        """Append a row covering the given (1-based) columns."""
+        first = None
+        for c in columns:
+            node = len(self.C)
+            self.C.append(c)
+            self.row_of.append(len(self.rows))
+            self.U.append(self.U[c])
+            self.D.append(c)
+            self.D[self.U[c]] = node
+            self.U[c] = node
+            self.S[c] += 1
+            if first is None:
+                first = node
+                self.L.append(node)
+                self.R.append(node)
+            else:
+                self.L.append(self.L[first])
+                self.R.append(first)
+                self.R[self.L[first]] = node
+                self.L[first] = node
+        self.rows.append(data)
+
+    def cover(self, c: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c: int):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def _select(self, r: int):
+        """Cover every column of the row containing node `r`."""
+        j = r
+        while True:
+            c = self.C[j]
+            if c <= self.n_primary:
+                self.cover(c)
+            else:
+                # Take one unit of a secondary column, and cover it
+                # once its capacity is used up
+                self.remaining[c] -= 1
+                if self.remaining[c] == 0:
+                    self.cover(c)
+            j = self.R[j]
+            if j == r:
+                break
+
+    def _deselect(self, r: int):
+        """Undo `_select(r)`, in reverse order."""
+        j = self.L[r]
+        while True:
+            c = self.C[j]
+            if c <= self.n_primary:
+                self.uncover(c)
+            else:
+                if self.remaining[c] == 0:
+                    self.uncover(c)
+                self.remaining[c] += 1
+            if j == r:
+                break
+            j = self.L[j]
+
+    def search(self, stop=None, stats=None):
+        """Yield every exact cover as a list of row data (Algorithm X).
+
+        Branches on the primary column with the fewest remaining rows.
+        If given, `stop` is called at every node and ends the search
+        once it returns True; the matrix cannot be searched again after.
+        If given, `stats` (a `SearchStats`) counts nodes and backtracks.
+        """
+        L, R, D, S = self.L, self.R, self.D, self.S
+        solution = []
+
+        class SearchStoppedException(Exception):
+            pass
+
+        def recurse():
+            if stop is not None and stop():
+                raise SearchStoppedException
+            if stats is not None:
+                stats.node(len(solution))
+            if R[0] == 0:
+                yield [self.rows[self.row_of[r]] for r in solution]
+                return
+
+            c = R[0]
+            best = c
+            while c != 0:
+                if S[c] < S[best]:
+                    best = c
+                c = R[c]
+            if S[best] == 0:
+                return
+
+            r = D[best]
+            while r != best:
+                # Selecting from the node in `best` covers that column first,
+                # which unlinks the row itself from every other column
+                solution.append(r)
+                self._select(r)
+                yield from recurse()
+                self._deselect(r)
+                solution.pop()
+                if stats is not None:
+                    stats.backtrack(len(solution))
+                r = D[r]
+
+        try:
+            yield from recurse()
+        except SearchStoppedException:
+            return
+
+    def count(self, stop=None, stats=None, limit=None) -> int:
+        """Return the number of exact covers, without building any of them.
+
+        Takes the same `stop` and `stats` as `search`; once stopped,
+        returns the number of covers found so far. Stops as well once
+        `limit` covers are found, e.g. 2 to tell whether a cover is unique.
+        """
+        R, D, S = self.R, self.D, self.S
+        found = 0
+
+        class SearchStoppedException(Exception):
+            pass
+
+        def recurse(depth):
+            nonlocal found
+            if stop is not None and stop():
+                raise SearchStoppedException
+            if stats is not None:
+                stats.node(depth)
+            if R[0] == 0:
+                found += 1
+                if limit is not None and found >= limit:
+                    raise SearchStoppedException
+                return
+
+            c = R[0]
+            best = c
+            while c != 0:
+                if S[c] < S[best]:
+                    best = c
+                c = R[c]
+            if S[best] == 0:
+                return
+
+            r = D[best]
+            while r != best:
+                self._select(r)
+                recurse(depth + 1)
+                self._deselect(r)
+                if stats is not None:
+                    stats.backtrack(depth)
+                r = D[r]
+
+        try:
+            recurse(0)
+        except SearchStoppedException:
+            pass
+        return found
+
+
+def build_exact_cover(G: Game, symmetry=False) -> ExactCover:
+    """Translate a game into an exact-cover matrix.
+
+    Primary columns are the empty fields of the grid. Each remaining
+    piece type gets a secondary column with capacity equal to the number
+    of pieces left, so that pieces need not all be used. Rows are the
+    placements that fit the grid, labelled with (piece, x, y, orientation).
+
+    With `symmetry`, one piece is restricted to canonical placements under
+    the symmetries of the board, so solutions that are mirror or rotated
+    images of each other are mostly found only once.
+    """
+    symmetries = board_symmetries(G.grid) if symmetry else []
+    restricted = symmetry_breaking_piece(G) if symmetries else None
+
+    Nx, Ny = G.grid.shape
+    empty = [b for b in range(Nx * Ny) if not G.grid.occupied >> b & 1]
+    column_of = {b: i + 1 for i, b in enumerate(empty)}
+
+    codes = [code for code, n in G.pieces_left.items() if n > 0]
+    matrix = ExactCover(
+        n_primary=len(empty), capacities=[G.pieces_left[code] for code in codes]
+    )
+
+    for k, code in enumerate(codes):
+        piece = G._get_piece(code)
+        piece_column = len(empty) + 1 + k
+        for x, y, orientation, mask in G.grid.iter_placements(code):
+            if code == restricted and not is_canonical(mask, symmetries):
+                continue
+            columns = []
+            while mask:
+                low = mask & -mask
+                columns.append(column_of[low.bit_length() - 1])
+                mask ^= low
+            columns.append(piece_column)
+            matrix.add_row(columns, data=(piece, x, y, orientation))
+
+    return matrix
+
+
+def iter_exact_covers(G: Game, stop=None, symmetry=False, stats=None):
+    """Yield each solution of the game as the last `SolutionNode` of
+    a chain of placements, without modifying the game."""
+    matrix = build_exact_cover(G, symmetry=symmetry)
+    for rows in matrix.search(stop=stop, stats=stats):
+        yield build_chain(
+            [(piece, Point(x, y), orientation) for piece, x, y, orientation in rows]
+        )
+
+
+def solve_dlx(G: Game, find_all=False, verbose=False, symmetry=False, stats=None):
+    """Exact-cover solver using Knuth's Algorithm X with dancing links.
+
+    Every empty field must be covered by exactly one placement, and each
+    piece type is used at most as many times as there are pieces left.
+
+    Returns the last `SolutionNode` of the first solution, and places it
+    on the game grid. With `find_all`, returns a list with the last node
+    of every solution instead, and leaves the game unchanged.
+    Returns None (or an empty list) if the game has no solution.
+    With `symmetry`, mirror and rotated images of solutions are skipped
+    (see `build_exact_cover`). If given, `stats` counts nodes and backtracks.
+    """
+    if find_all:
+        solutions = list(iter_exact_covers(G, symmetry=symmetry, stats=stats))
+        if verbose:
+            print(f"Found {len(solutions)} solutions")
+        return solutions
+
+    solution = next(iter_exact_covers(G, symmetry=symmetry, stats=stats), None)
+    if solution is None:
+        if verbose:
+            print("No solution found")
+        return None
+
+    for piece, point, orientation in get_solution(solution):
+        G.place(piece.code, at=point, orientation=orientation)
+
+    if verbose:
+        print("Grid complete!")
+        print(G.grid)
+
+    return solution
@@ -0,0 +1,84 @@
+from game import Game, piece_bitmask
+from solvers.dlx import build_exact_cover
+from solvers.symmetry import board_symmetries, symmetry_breaking_piece, transform_mask
+
+
+def _solution_key(placements: list, width: int, permutation=None) -> tuple:
+    """Return a sortable key identifying the tiling made by `placements`,
+    optionally after mapping it through a symmetry `permutation`."""
+    key = []
+    for code, x, y, orientation in placements:
+        _, (min_dx, min_dy, _, _), mask = piece_bitmask(code, orientation, width)
+        mask <<= (y + min_dy) * width + (x + min_dx)
+        if permutation is not None:
+            mask = transform_mask(mask, permutation)
+        key.append((mask, code))
+    return tuple(sorted(key))
+
+
+def _is_canonical_solution(placements: list, width: int, symmetries: list) -> bool:
+    """Return whether a solution is the smallest of its images under `symmetries`."""
+    key = _solution_key(placements, width)
+    return all(key <= _solution_key(placements, width, p) for p in symmetries)
+
+
+def iter_solutions(G: Game, limit=None, unique=False, stop=None, stats=None):
+    """Lazily yield every solution of the game, without modifying it.
+
+    Each solution is a list of (code, x, y, orientation), one per
+    placement still to make, so streaming solutions to disk or counting
+    them needs no more memory than a single one.
+
+    `limit` caps the number of solutions yielded. With `unique`, only one
+    solution is yielded per class of solutions that are mirror or rotated
+    images of each other under the symmetries of the board. `stop` and
+    `stats` are passed on to the search (see `ExactCover.search`).
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    width = G.grid.shape[0]
+    symmetries = board_symmetries(G.grid) if unique else []
+    matrix = build_exact_cover(G, symmetry=unique)
+
+    # With one piece restricted to canonical placements, only images that
+    # leave that piece in place can still be found twice
+    restricted = symmetry_breaking_piece(G) if symmetries else None
+
+    found = 0
+    for rows in matrix.search(stop=stop, stats=stats):
+        placements = [
+            (piece.code, x, y, orientation) for piece, x, y, orientation in rows
+        ]
+        if symmetries:
+            if restricted is None:
+                candidates = symmetries
+            else:
+                fixed = [q for q in placements if q[0] == restricted]
+                fixed_key = _solution_key(fixed, width)
+                candidates = [
+                    p for p in symmetries if _solution_key(fixed, width, p) == fixed_key
+                ]
+            if not _is_canonical_solution(placements, width, candidates):
+                continue
+
+        yield placements
+        found += 1
+        if limit is not None and found >= limit:
+            return
+
+
+def count_solutions(G: Game, unique=False, stop=None, stats=None, limit=None) -> int:
+    """Return the number of solutions of the game, counting no further
+    than `limit` if given.
+
+    Without `unique`, counts exact covers directly and never builds a
+    placement list. With `unique`, every solution has to be inspected
+    to tell it apart from its images, so this streams `iter_solutions`.
+    """
+    if limit is not None and limit <= 0:
+        return 0
+    if unique:
+        solutions = iter_solutions(G, limit=limit, unique=True, stop=stop, stats=stats)
+        return sum(1 for _ in solutions)
+    return build_exact_cover(G).count(stop=stop, stats=stats, limit=limit)
@@ -1,137 +1,322 @@
-from itertools import product
+from game import Game
+from serialization import puzzle_to_dict
+from solvers.decomposition import RegionSolver
+from solvers.placement_index import get_placement_index
+from solvers.propagation import propagate, propagating
+from solvers.search import HeuristicSearch
+from solvers.solution import build_chain
+from utils import Point
 
-from game import Game, Grid
-from pieces import COLORS
-from utils import Point, AdjacencyList
-from solvers.solution import SolutionNode, get_previous_state, prepopulate_grid
 
+def _legal_placements(index, occupied: int, pieces_left: dict) -> dict:
+    return {
+        code: index.fitting(code, occupied) for code, n in pieces_left.items() if n > 0
+    }
 
-def solve_brute_force(G: Game, verbose=False):
+
+def legal_placements(G: Game) -> dict:
+    """Return every placement of every remaining piece type that fits
+    the grid, as a mapping of code to a list of (x, y, orientation, bitmask)."""
+    index = get_placement_index(G.grid.shape)
+    return _legal_placements(index, G.grid.occupied, G.pieces_left)
+
+
+# The strategies below pick candidates from a placement index, the occupied
+# fields and the pieces left, so the region solver can use them as well
+
+
+def _first_piece(index, occupied: int, pieces_left: dict) -> list:
+    code = next((code for code, n in pieces_left.items() if n > 0), None)
+    if code is None:
+        return []
+    return [(code, x, y, ori) for x, y, ori, _ in index.fitting(code, occupied)]
+
+
+def _raster_cell(index, occupied: int, pieces_left: dict) -> list:
+    empty = index.full & ~occupied
+    cell = empty & -empty
+    return [
+        (code, x, y, ori)
+        for code, n in pieces_left.items()
+        if n > 0
+        for x, y, ori, _ in index.fitting_cell(code, cell, occupied)
+    ]
+
+
+def _min_cell(index, occupied: int, pieces_left: dict) -> list:
+    placements = _legal_placements(index, occupied, pieces_left)
+    counts = {}
+    for code_placements in placements.values():
+        for _, _, _, mask in code_placements:
+            while mask:
+                low = mask & -mask
+                counts[low] = counts.get(low, 0) + 1
+                mask ^= low
+
+    empty = index.full & ~occupied
+    best, best_count = None, None
+    while empty:
+        cell = empty & -empty
+        count = counts.get(cell, 0)
+        if best is None or count < best_count:
+            best, best_count = cell, count
+            if count == 0:
+                return []
+        empty ^= cell
+
+    return [
+        (code, x, y, ori)
+        for code, code_placements in placements.items()
+        for x, y, ori, mask in code_placements
+        if mask & best
+    ]
+
+
+def _min_piece(index, occupied: int, pieces_left: dict) -> list:
+    placements = _legal_placements(index, occupied, pieces_left)
+    if not placements:
+        return []
+
+    code = min(placements, key=lambda code: len(placements[code]))
+    return [(code, x, y, ori) for x, y, ori, _ in placements[code]]
+
+
+def branch_first_piece(G: Game) -> list:
+    """Place the first remaining piece type, trying every anchor
+    in raster order and every orientation."""
+    index = get_placement_index(G.grid.shape)
+    return _first_piece(index, G.grid.occupied, G.pieces_left)
+
+
+def branch_raster_cell(G: Game) -> list:
+    """Fill the first empty field in raster order, trying every placement
+    of every remaining piece type that covers it."""
+    index = get_placement_index(G.grid.shape)
+    return _raster_cell(index, G.grid.occupied, G.pieces_left)
+
+
+def branch_min_cell(G: Game) -> list:
+    """Fill the empty field with the fewest legal covering placements,
+    trying each of those placements."""
+    index = get_placement_index(G.grid.shape)
+    return _min_cell(index, G.grid.occupied, G.pieces_left)
+
+
+def branch_min_piece(G: Game) -> list:
+    """Place the remaining piece type with the fewest legal placements,
+    trying each of those placements."""
+    index = get_placement_index(G.grid.shape)
+    return _min_piece(index, G.grid.occupied, G.pieces_left)
+
+
+BRANCHING_STRATEGIES = {
+    "first-piece": branch_first_piece,
+    "raster-cell": branch_raster_cell,
+    "min-cell": branch_min_cell,
+    "min-piece": branch_min_piece,
+}
+
+# The same strategies, for the region solver
+_REGION_BRANCHING = {
+    "first-piece": _first_piece,
+    "raster-cell": _raster_cell,
+    "min-cell": _min_cell,
+    "min-piece": _min_piece,
+}
+
+# Strategies that branch on a piece rather than a field; these can reach the
+# same solution by placing identical pieces in a different order
+PIECE_BRANCHING = ("first-piece", "min-piece")
+
+
+def solve_brute_force(
+    G: Game,
+    verbose=False,
+    stop=None,
+    branching="first-piece",
+    symmetry=True,
+    stats=None,
+    transpositions=None,
+    checkpoint=None,
+    propagation=True,
+    decomposition=True,
+    node_propagation=False,
+):
     """Brute-force solver, but using simple heuristics.
 
-    The solver generates an adjacency list of the grid graph, and finds all connected components.
-    On each recursion, it compares these components against the remaining pieces, based on the size or span of the component.
-    If this check fails, it rolls back 1 placement.
+    The solver keeps track of the connected components of empty fields as pieces are placed and undone.
+    On each node, it compares these components against the remaining pieces, based on the size or span of the component.
+    If this check fails, it undoes the last placement in place.
+    The search runs on an explicit stack (see `HeuristicSearch`), so it is not limited by the recursion limit.
+
+    `branching` picks what to branch on at each step: the name of one of
+    `BRANCHING_STRATEGIES`, or any function of the game that returns the
+    placements to try as a list of (code, x, y, orientation).
+    - "first-piece": every anchor and orientation of the first remaining piece
+    - "raster-cell": every placement covering the first empty field
+    - "min-cell": every placement covering the empty field with fewest of them
+    - "min-piece": every placement of the piece with fewest of them
+
+    With `symmetry`, placements that only lead to mirror or rotated images
+    of other solutions are skipped: one piece is restricted to canonical
+    placements under the symmetries of the board, and when branching on
+    pieces, identical pieces are only placed in increasing bitmask order.
+
+    If given, `stats` (a `SearchStats`) counts nodes, backtracks, placement
+    attempts and pruned nodes, and times branching and pruning.
+
+    If given, `transpositions` (a `TranspositionTable`) stores the states
+    found to be dead ends, keyed by a Zobrist hash of the occupied fields
+    and the pieces left, and prunes them when they are reached again by
+    placing pieces in a different order. A table must only be shared
+    between searches of the same game with the same options.
+
+    If given, `checkpoint` (a `Checkpoint`) periodically saves the position
+    of the search: the stack of placements from the root, each with its
+    index among the candidates of the branching strategy. If the checkpoint
+    file already exists, the search resumes exactly where it was saved.
+    The file is removed once the search finishes, and saved when `stop`
+    ends the search early.
+
+    With `propagation`, constraints are propagated once before searching
+    (see `propagate`): forced placements are made right away and are part
+    of the solution, and a game that cannot be completed is given up
+    without any search. With `node_propagation`, they are propagated at
+    every node before branching as well (see `propagating`). This prunes
+    more, but the check costs a pass over every legal placement per node.
+
+    With `decomposition`, once the empty fields are split into several
+    regions, they are solved separately, over every way of sharing out the
+    remaining pieces (see `RegionSolver`), so that the search costs the sum
+    of the regions rather than their product. Regions are searched with
+    the same branching strategy; decomposition needs a named strategy,
+    and is skipped with a branching function.
+
+    Returns the last `SolutionNode` of the solution, or None if there is none.
+    If given, `stop` is called before each placement attempt, and the search
+    gives up (returning None) once it returns True.
     """
-    C, R = G.grid.shape
-
-    def get_piece():
-        return G._get_piece(next(filter(lambda c: c[1] > 0, G.pieces_left.items()))[0])
-
-    def rollback_to(game: Game, grid_state: tuple([Grid, dict])):
-        if grid_state is not None:
-            grid, pieces_left = grid_state
-            game.grid = grid
-            game.pieces_left = pieces_left
-            return True
-        else:
-            return False
-
-    def check_no_space_left(game):
-        """Check whether Grid can accomodate any more pieces."""
-
-        def span(node_list):
-            """Return the span of the list of nodes; that is, the shape
-            of the smallest rectangle that can contain all nodes."""
-            xs = []
-            ys = []
-            for (x, y) in node_list:
-                xs.append(x)
-                ys.append(y)
-            min_x, max_x = min(xs), max(xs)
-            min_y, max_y = min(ys), max(ys)
-
-            return (max_x - min_x + 1, max_y - min_y + 1)
-
-        def check_fit_in_span(piece, span):
-            """Check whether any possible orientation
-            of `piece` would fit in `span`.
-            """
-            X, Y = span
-            no_fit = []
-            for piece_span in piece.spans:
-                px, py = piece_span
-                no_fit.append((px > X or py > Y))
-
-            return not (all(no_fit))
-
-        piece_nodes = []
-        C, R = game.grid.shape
-        for y in range(R):
-            for x in range(C):
-                field = game.grid[x, y]
-                piece, _ = field.node
-                if piece is not None:
-                    piece_nodes.append((x, y))
-        A = AdjacencyList(grid_shape=game.grid.shape, inaccessible=piece_nodes)
-        components = A.find_connected_components()
-
-        pieces_left = [code for code, n in game.pieces_left.items() if n > 0]
-        color_codes = {piece.code: piece for piece in COLORS}
-        # Try to find a component that won't fit any piece (by n empty nodes)
-        for nodes in components.values():
-            c_size = len(nodes)
-            smallest_piece = min([color_codes[code].size for code in pieces_left])
-            if smallest_piece > c_size:
-                return True
-
-        # Try to find a piece that won't fit in any empty space (by span)
-        for code in pieces_left:
-            piece = color_codes[code]
-            fit = []
-            for nodes in components.values():
-                c_span = span(nodes)
-                fit.append(check_fit_in_span(piece, c_span))
-            if not (any(fit)):
-                return True
-
-        return False
-
-    class GridCompleteException(Exception):
-        pass
-
-    def place_nth_piece(n, previous_node=None, verbose=verbose):
-        """Cycle through all piece positions and orientations.
-        If found a valid placement, attempt to place the next piece
-        """
-        piece = get_piece()
-        current_node = previous_node
-        placed = False
-        if verbose:
-            print(f"\nPlacing piece {n}: {piece}")
-
-        no_space_left = check_no_space_left(game=G)
-        if not no_space_left:
-            for y, x, ori in product(range(R), range(C), piece.valid_orientations):
-                placed = G.place(piece.code, at=Point(x, y), orientation=ori)
-                if placed:
-                    current_node = SolutionNode(
-                        piece=piece, point=Point(x, y), orientation=ori
-                    )
-                    current_node.previous = previous_node
-                    if verbose:
-                        print(f"Piece placed! {G.pieces_left} pieces left")
-                        print(G.grid)
-
-                    if G.grid._is_complete():
-                        raise GridCompleteException
-                    else:
-                        place_nth_piece(n + 1, previous_node=current_node)
-
-        if (not placed) or (no_space_left):
+    ordered = symmetry and branching in PIECE_BRANCHING
+    if callable(branching):
+        strategy = getattr(branching, "__name__", repr(branching))
+    else:
+        strategy = branching
+        branching = BRANCHING_STRATEGIES[branching]
+    if node_propagation:
+        # Identical pieces are placed in order, which forcing one could break
+        forceable = [code for code, n in G.pieces_left.items() if n <= 1]
+        branching = propagating(
+            branching, stats=stats, forceable=forceable if ordered else None
+        )
+
+    on_node = None
+    saved = None
+    if checkpoint is not None:
+        puzzle = puzzle_to_dict(G)
+        saved = checkpoint.load()
+        if saved is not None and (
+            saved["puzzle"],
+            saved["branching"],
+            saved["symmetry"],
+            saved.get("propagation", False),
+            saved.get("decomposition", False),
+            saved.get("node_propagation", False),
+        ) != (
+            puzzle,
+            strategy,
+            symmetry,
+            propagation,
+            decomposition,
+            node_propagation,
+        ):
+            raise ValueError("Checkpoint was saved by a different search")
+
+        def save_checkpoint(search):
+            checkpoint.save(
+                {
+                    "puzzle": puzzle,
+                    "branching": strategy,
+                    "symmetry": symmetry,
+                    "propagation": propagation,
+                    "decomposition": decomposition,
+                    "node_propagation": node_propagation,
+                    "frames": search.position(),
+                    "nodes": search.nodes,
+                },
+                nodes=search.nodes,
+            )
+
+        def on_node(search):
+            if checkpoint.due(search.nodes):
+                save_checkpoint(search)
+
+    forced = []
+    if propagation:
+        forced = propagate(G, stats=stats)
+        if forced is None:
+            if checkpoint is not None:
+                checkpoint.clear()
             if verbose:
-                if no_space_left:
-                    print("No space left")
-                print(f"Couldn't place piece {n}. Rolling back to previous state.")
-            current_node = previous_node
-            pieces_placed = get_previous_state(current_node)
-            old_state = prepopulate_grid(G.grid.shape, G.n_pieces, pieces_placed)
-            rollback_to(game=G, grid_state=old_state)
-
-    try:
-        place_nth_piece(n=0)
-    except GridCompleteException:
+                print("No solution found")
+            return None
+    forced_chain = build_chain(
+        [(G._get_piece(code), Point(x, y), ori) for code, x, y, ori in forced]
+    )
+    if forced and G.grid._is_complete():
+        if checkpoint is not None:
+            checkpoint.clear()
+        if verbose:
+            print("Grid complete!")
+            print(G.grid)
+        return forced_chain
+
+    search = HeuristicSearch(
+        G,
+        branching,
+        symmetry=symmetry,
+        ordered=ordered,
+        stats=stats,
+        transpositions=transpositions,
+        on_node=on_node,
+        verbose=verbose,
+        decomposition=(
+            RegionSolver(
+                G.grid.shape,
+                stats=stats,
+                branching=_REGION_BRANCHING[strategy],
+            )
+            if decomposition and strategy in _REGION_BRANCHING
+            else None
+        ),
+    )
+    if saved is not None:
+        search.nodes = saved["nodes"]
+        search.resume(saved["frames"])
+
+    solution = search.run(stop=stop)
+    if not search.finished:
+        if checkpoint is not None:
+            save_checkpoint(search)
+        search.abandon()
+        for _ in forced:
+            G.undo()
+        return None
+
+    if checkpoint is not None:
+        checkpoint.clear()
+    if solution is None:
+        for _ in forced:
+            G.undo()
+        if verbose:
+            print("No solution found")
+        return None
+
+    first = solution
+    while first.previous is not None:
+        first = first.previous
+    first.previous = forced_chain
+
+    if verbose:
         print("Grid complete!")
         print(G.grid)
-    except Exception as e:
-        print(e)
+    return solution
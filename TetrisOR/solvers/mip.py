@@ -0,0 +1,98 @@
+from ortools.linear_solver import pywraplp
+
+from game import Game
+from utils import Point
+from solvers.solution import SolutionNode
+
+# OR-Tools' own CBC build has no threads: it accepts a thread count,
+# then ignores it when solving
+_SINGLE_THREADED = ("CBC", "CBC_MIXED_INTEGER_PROGRAMMING")
+
+
+def build_model(G: Game, backend: str = "SAT"):
+    """Formulate the game as a binary placement-selection program.
+
+    There is one binary variable per (piece, orientation, anchor) that
+    fits the grid. Every empty field must be covered by exactly one
+    selected placement, and each piece type can be selected at most as
+    many times as there are pieces left. There is no objective; any
+    feasible selection tiles the grid.
+
+    Returns (solver, placements), where placements is a list of
+    (variable, (piece, x, y, orientation)).
+    """
+    solver = pywraplp.Solver.CreateSolver(backend)
+    if solver is None:
+        raise ValueError(f"MIP backend not available: {backend}")
+
+    Nx, Ny = G.grid.shape
+    covering = {b: [] for b in range(Nx * Ny) if not G.grid.occupied >> b & 1}
+    placements = []
+
+    for code, n in G.pieces_left.items():
+        if n <= 0:
+            continue
+
+        piece = G._get_piece(code)
+        piece_vars = []
+        for x, y, orientation, mask in G.grid.iter_placements(code):
+            var = solver.BoolVar(f"{code}_{orientation}_{x}_{y}")
+            piece_vars.append(var)
+            placements.append((var, (piece, x, y, orientation)))
+            while mask:
+                low = mask & -mask
+                covering[low.bit_length() - 1].append(var)
+                mask ^= low
+
+        solver.Add(solver.Sum(piece_vars) <= n)
+
+    for b, cover in covering.items():
+        solver.Add(solver.Sum(cover) == 1)
+
+    return solver, placements
+
+
+def solve_mip(
+    G: Game, backend="SAT", time_limit=None, threads=None, verbose=False, stats=None
+):
+    """Mixed-integer programming solver.
+
+    `backend` is any OR-Tools linear solver id, e.g. "SAT" (CP-SAT),
+    "CBC", "SCIP" or "HIGHS". `time_limit` is in seconds. `threads` sets
+    the number of solver threads, on the backends that support it, such
+    as "SAT" and "SCIP"; others, including "CBC", raise a ValueError. If
+    given, `stats` (a `SearchStats`) records the branch-and-bound nodes
+    reported by the backend.
+
+    Returns the last `SolutionNode` of the solution and places it on
+    the game grid, or returns None if the game has no solution or none
+    was found within the time limit.
+    """
+    solver, placements = build_model(G, backend=backend)
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    if threads is not None:
+        if backend.upper() in _SINGLE_THREADED or not solver.SetNumThreads(threads):
+            raise ValueError(f"MIP backend does not support threads: {backend}")
+
+    status = solver.Solve()
+    if stats is not None:
+        stats.nodes += solver.nodes()
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        if verbose:
+            print("No solution found")
+        return None
+
+    node = None
+    for var, (piece, x, y, orientation) in placements:
+        if var.solution_value() > 0.5:
+            previous = node
+            node = SolutionNode(piece=piece, point=Point(x, y), orientation=orientation)
+            node.previous = previous
+            G.place(piece.code, at=node.point, orientation=orientation)
+
+    if verbose:
+        print("Grid complete!")
+        print(G.grid)
+
+    return node
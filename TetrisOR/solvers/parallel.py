@@ -0,0 +1,166 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game import Game
+from pieces import load_pieces, piece_definitions
+from serialization import puzzle_from_dict, puzzle_to_dict
+from utils import Point
+from solvers.dlx import iter_exact_covers
+from solvers.heuristic import solve_brute_force
+from solvers.solution import build_chain, get_solution
+
+_stop_event = None
+
+
+def _init_worker(stop_event, definitions):
+    global _stop_event
+    _stop_event = stop_event
+    # Workers that were not forked only know the built-in pieces
+    load_pieces(definitions)
+
+
+def _stopped() -> bool:
+    return _stop_event.is_set()
+
+
+def split_game(G: Game, depth: int = 1) -> list:
+    """Split the search tree of a game into independent subtrees.
+
+    Branches cell-first: the first empty field in raster order must be
+    covered by exactly one placement, so the placements covering it
+    partition the solutions. Repeats on each branch, `depth` times.
+
+    Returns a list of prefixes, each a list of (code, x, y, orientation).
+    Branches that complete the grid early are kept as they are.
+    """
+    prefixes = []
+
+    def expand(prefix, level):
+        empty = ~G.grid.occupied & G.grid._full
+        if level == depth or not empty:
+            prefixes.append(list(prefix))
+            return
+
+        cell = empty & -empty
+        for code, n in G.pieces_left.items():
+            if n <= 0:
+                continue
+            for x, y, orientation, mask in list(G.grid.iter_placements(code)):
+                if mask & cell:
+                    G.place(code, at=Point(x, y), orientation=orientation)
+                    prefix.append((code, x, y, orientation))
+                    expand(prefix, level + 1)
+                    prefix.pop()
+                    G.undo()
+
+    expand([], 0)
+    return prefixes
+
+
+def _solve_subtree(puzzle: dict, prefix: list, solver: str, find_all: bool):
+    """Worker task: apply `prefix` to the game of `puzzle` and search the rest.
+    Return a list of solutions, each a list of (code, x, y, orientation)."""
+    G = puzzle_from_dict(puzzle)
+    for code, x, y, orientation in prefix:
+        G.place(code, at=Point(x, y), orientation=orientation)
+    placed = [
+        (piece.code, point.x, point.y, orientation)
+        for piece, point, orientation in G.history
+    ]
+
+    if G.grid._is_complete():
+        return [placed]
+
+    if solver == "heuristic":
+        solution = solve_brute_force(G, stop=_stopped)
+        solutions = [solution] if solution is not None else []
+    else:
+        solutions = iter_exact_covers(G, stop=_stopped)
+        if not find_all:
+            first = next(solutions, None)
+            solutions = [first] if first is not None else []
+
+    return [
+        placed
+        + [
+            (piece.code, point.x, point.y, orientation)
+            for piece, point, orientation in get_solution(solution)
+        ]
+        for solution in solutions
+    ]
+
+
+def solve_parallel(
+    G: Game, solver="dlx", depth=1, workers=None, find_all=False, verbose=False
+):
+    """Search subtrees of the game in parallel worker processes.
+
+    The tree is split at the first `depth` placements (see `split_game`),
+    and each subtree is searched by `solver` ("dlx" or "heuristic") on its
+    own copy of the game. Once any worker finds a solution, the others are
+    told to stop. With `find_all`, every solution is collected instead
+    (only supported by "dlx").
+
+    Returns the last `SolutionNode` of the first solution found, and places
+    it on the game grid. With `find_all`, returns a list with the last node
+    of every solution instead, and leaves the game unchanged.
+    """
+    if solver not in ("dlx", "heuristic"):
+        raise ValueError(f"Unknown solver: {solver}")
+    if find_all and solver != "dlx":
+        raise ValueError("Enumerating all solutions requires the dlx solver")
+
+    prefixes = split_game(G, depth=depth)
+    if verbose:
+        print(f"Split search into {len(prefixes)} subtrees")
+
+    results = []
+    stop_event = multiprocessing.Event()
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(stop_event, piece_definitions(G.n_pieces)),
+    ) as executor:
+        puzzle = puzzle_to_dict(G)
+        futures = [
+            executor.submit(_solve_subtree, puzzle, prefix, solver, find_all)
+            for prefix in prefixes
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+            if results and not find_all:
+                stop_event.set()
+                for f in futures:
+                    f.cancel()
+                break
+
+    start = len(G.history)
+    chains = []
+    for placements in results:
+        chains.append(
+            build_chain(
+                [
+                    (G._get_piece(code), Point(x, y), orientation)
+                    for code, x, y, orientation in placements[start:]
+                ]
+            )
+        )
+
+    if find_all:
+        if verbose:
+            print(f"Found {len(chains)} solutions")
+        return chains
+
+    if not chains:
+        if verbose:
+            print("No solution found")
+        return None
+
+    for piece, point, orientation in get_solution(chains[0]):
+        G.place(piece.code, at=point, orientation=orientation)
+    if verbose:
+        print("Grid complete!")
+        print(G.grid)
+
+    return chains[0]
@@ -0,0 +1,134 @@
+import os
+import pickle
+import tempfile
+
+from game import piece_bitmask
+from pieces import DISTINCT_ORIENTATIONS, piece_set_fingerprint
+
+_INDEXES = {}
+
+
+class PlacementIndex:
+    """Every in-bounds placement of every piece type on an empty board.
+
+    - placements maps code to a list of (x, y, orientation, bitmask),
+      in raster order of the anchor, then by orientation
+    - covering maps code to {field bit: placements covering that field}
+
+    Placements are only tested against the occupied fields, since
+    anchors that put the piece out of bounds were never indexed.
+    """
+
+    def __init__(self, shape: tuple):
+        self.shape = shape
+        self.fingerprint = piece_set_fingerprint()
+        Nx, Ny = shape
+        self.placements = {}
+        self.covering = {}
+        for code, orientations in DISTINCT_ORIENTATIONS.items():
+            bounds = {o: piece_bitmask(code, o, Nx) for o in orientations}
+            placements = []
+            for y in range(Ny):
+                for x in range(Nx):
+                    for orientation in orientations:
+                        _, (min_dx, min_dy, max_dx, max_dy), mask = bounds[orientation]
+                        if (
+                            x + min_dx < 0
+                            or y + min_dy < 0
+                            or x + max_dx >= Nx
+                            or y + max_dy >= Ny
+                        ):
+                            continue
+                        mask <<= (y + min_dy) * Nx + (x + min_dx)
+                        placements.append((x, y, orientation, mask))
+
+            covering = {1 << b: [] for b in range(Nx * Ny)}
+            for placement in placements:
+                mask = placement[3]
+                while mask:
+                    low = mask & -mask
+                    covering[low].append(placement)
+                    mask ^= low
+
+            self.placements[code] = placements
+            self.covering[code] = covering
+
+    @property
+    def full(self) -> int:
+        """Return the bitmask of every field of the board."""
+        Nx, Ny = self.shape
+        return (1 << Nx * Ny) - 1
+
+    def fitting(self, code: str, occupied: int) -> list:
+        """Return the placements of `code` that avoid the `occupied` fields."""
+        return [p for p in self.placements[code] if not occupied & p[3]]
+
+    def fitting_cell(self, code: str, cell: int, occupied: int) -> list:
+        """Return the placements of `code` covering field bit `cell`
+        that avoid the `occupied` fields."""
+        return [p for p in self.covering[code][cell] if not occupied & p[3]]
+
+
+def _cache_path(shape: tuple, cache_dir: str, fingerprint: str) -> str:
+    Nx, Ny = shape
+    return os.path.join(cache_dir, f"placements_{Nx}x{Ny}_{fingerprint}.pickle")
+
+
+def _remove_stale(shape: tuple, cache_dir: str, fingerprint: str):
+    """Remove the cached indexes of a shape built for other piece sets."""
+    prefix = os.path.basename(_cache_path(shape, cache_dir, ""))[: -len(".pickle")]
+    current = os.path.basename(_cache_path(shape, cache_dir, fingerprint))
+    for name in os.listdir(cache_dir):
+        if name.startswith(prefix) and name.endswith(".pickle") and name != current:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def get_placement_index(shape: tuple, cache_dir=None) -> PlacementIndex:
+    """Return the placement index of a board shape.
+
+    Indexes are built once per process, and loaded from or saved to
+    `cache_dir` if given, or else the directory in the TETRISOR_CACHE
+    environment variable. Without either, nothing is written to disk.
+    Saving an index removes those of the same shape saved for other
+    piece sets.
+    """
+    shape = tuple(shape)
+    if cache_dir is None:
+        cache_dir = os.environ.get("TETRISOR_CACHE")
+    # Changes whenever pieces are registered, so stale indexes are rebuilt
+    fingerprint = piece_set_fingerprint()
+    index = _INDEXES.get(shape)
+    if index is not None and index.fingerprint == fingerprint:
+        return index
+
+    index = None
+    path = None
+    if cache_dir is not None:
+        path = _cache_path(shape, cache_dir, fingerprint)
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    index = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                index = None
+
+    if index is None:
+        index = PlacementIndex(shape)
+        if path is not None:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write to a temporary file first, so that concurrent
+                # processes never read a partial index
+                fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+                _remove_stale(shape, cache_dir, fingerprint)
+            except OSError:
+                pass
+
+    _INDEXES[shape] = index
+    return index
@@ -0,0 +1,124 @@
+from game import Game
+from pieces import get_piece
+from utils import Point
+from solvers.placement_index import get_placement_index
+from solvers.pruning import EmptyRegions
+
+
+def reachable_sizes(sizes: list) -> int:
+    """Return the region sizes that some sub-multiset of pieces of
+    `sizes` can exactly fill, as a bitset: bit k is set iff k is reachable."""
+    reachable = 1
+    for size in sizes:
+        reachable |= reachable << size
+    return reachable
+
+
+def check(G: Game, forceable=None) -> tuple:
+    """Look for a placement forced by the current position.
+
+    - An empty region that no sub-multiset of the remaining pieces can fill
+      exactly (by subset-sum over the piece sizes) makes the game infeasible.
+    - If the remaining pieces exactly fill the empty fields, every one of
+      them has to be placed: a piece type with fewer legal placements than
+      pieces left makes the game infeasible, and a single piece with a
+      single legal placement is forced.
+    - An empty field covered by no legal placement makes the game infeasible,
+      and one covered by exactly one legal placement forces it.
+
+    Only placements of the piece types in `forceable`, if given, are forced.
+    Returns (rule, None) with the rule that proved the game infeasible,
+    (None, (code, x, y, orientation)) for a forced placement,
+    or (None, None) if nothing is forced.
+    """
+    occupied = G.grid.occupied
+    empty = G.grid._full & ~occupied
+    if not empty:
+        return None, None
+
+    left = {code: n for code, n in G.pieces_left.items() if n > 0}
+    piece_sizes = [get_piece(code).size for code, n in left.items() for _ in range(n)]
+    reachable = reachable_sizes(piece_sizes)
+    for region in EmptyRegions(G.grid).regions:
+        if not reachable >> region.size & 1:
+            return "subset-sum", None
+
+    def forceable_code(code):
+        return forceable is None or code in forceable
+
+    index = get_placement_index(G.grid.shape)
+    placements = {code: index.fitting(code, occupied) for code in left}
+    if sum(piece_sizes) == bin(empty).count("1"):
+        for code, n in left.items():
+            if len(placements[code]) < n:
+                return "no-placement", None
+            if n == 1 and len(placements[code]) == 1 and forceable_code(code):
+                return None, (code, *placements[code][0][:3])
+
+    covers = {}
+    for code, code_placements in placements.items():
+        for x, y, ori, mask in code_placements:
+            while mask:
+                low = mask & -mask
+                covers.setdefault(low, []).append((code, x, y, ori))
+                mask ^= low
+
+    forcing = None
+    while empty:
+        cell = empty & -empty
+        cell_covers = covers.get(cell)
+        if not cell_covers:
+            return "uncovered-field", None
+        if (
+            len(cell_covers) == 1
+            and forcing is None
+            and forceable_code(cell_covers[0][0])
+        ):
+            forcing = cell_covers[0]
+        empty ^= cell
+    return None, forcing
+
+
+def propagate(G: Game, stats=None) -> list:
+    """Place every piece that is forced by the current position (see `check`),
+    until nothing more is forced.
+
+    Returns the forced placements as a list of (code, x, y, orientation),
+    left on the grid, or None if the game is infeasible, in which case the
+    grid is left as it was. If given, `stats` (a `SearchStats`) counts the
+    rule that proved the game infeasible.
+    """
+    forced = []
+    while True:
+        rule, forcing = check(G)
+        if rule is not None:
+            if stats is not None:
+                stats.prune(rule)
+            for _ in forced:
+                G.undo()
+            return None
+        if forcing is None:
+            return forced
+
+        code, x, y, orientation = forcing
+        G.place(code, at=Point(x, y), orientation=orientation)
+        forced.append(forcing)
+
+
+def propagating(branching, stats=None, forceable=None):
+    """Wrap a branching strategy to propagate constraints at every node:
+    a forced placement is the only candidate, an infeasible position has
+    none, and otherwise `branching` picks the candidates."""
+
+    def branch(G: Game) -> list:
+        rule, forcing = check(G, forceable=forceable)
+        if rule is not None:
+            if stats is not None:
+                stats.prune(rule)
+            return []
+        if forcing is not None:
+            return [forcing]
+        return branching(G)
+
+    branch.__doc__ = branching.__doc__
+    return branch
@@ -0,0 +1,165 @@
+from game import Grid
+from pieces import get_piece
+
+
+class Region:
+    """Connected region of empty fields, stored as a bitmask
+    over a row-major grid `width` fields wide."""
+
+    def __init__(self, mask: int, width: int):
+        self.mask = mask
+        self.width = width
+        self.size = bin(mask).count("1")
+
+        row = (1 << width) - 1
+        columns = 0
+        m = mask
+        while m:
+            columns |= m & row
+            m >>= width
+        low = mask & -mask
+        self._bounds = (
+            (columns & -columns).bit_length() - 1,
+            (low.bit_length() - 1) // width,
+            columns.bit_length() - 1,
+            (mask.bit_length() - 1) // width,
+        )
+
+    @property
+    def span(self) -> tuple:
+        """Return the shape of the smallest rectangle containing the region."""
+        min_x, min_y, max_x, max_y = self._bounds
+        return (max_x - min_x + 1, max_y - min_y + 1)
+
+    @property
+    def cells(self) -> list:
+        """Return the (x, y) coordinates of every field in the region."""
+        cells = []
+        m = self.mask
+        while m:
+            low = m & -m
+            b = low.bit_length() - 1
+            cells.append((b % self.width, b // self.width))
+            m ^= low
+        return cells
+
+    def __repr__(self):
+        return f"<Region of size {self.size}, span {self.span}>"
+
+
+class EmptyRegions:
+    """Connected components of the empty fields of a grid,
+    kept up to date as pieces are placed and removed.
+
+    Placing a piece only flood-fills the region it was placed in, and
+    removing a piece only merges the regions around it, so updates cost
+    O(affected fields) rather than a scan of the whole grid.
+    """
+
+    def __init__(self, grid: Grid):
+        Nx, Ny = grid.shape
+        self.width = Nx
+        self._full = (1 << (Nx * Ny)) - 1
+        left_column = 0
+        for y in range(Ny):
+            left_column |= 1 << (y * Nx)
+        self._not_left = self._full & ~left_column
+        self._not_right = self._full & ~(left_column << (Nx - 1))
+
+        self.regions = [
+            Region(region, self.width)
+            for region in self.components(self._full & ~grid.occupied)
+        ]
+
+    def _neighbours(self, mask: int) -> int:
+        """Return the fields orthogonally adjacent to `mask`."""
+        return (
+            ((mask << 1) & self._not_left)
+            | ((mask >> 1) & self._not_right)
+            | (mask << self.width)
+            | (mask >> self.width)
+        ) & self._full
+
+    def _flood(self, seed: int, within: int) -> int:
+        """Return the fields of `within` connected to `seed`."""
+        filled = seed
+        while True:
+            grown = (filled | self._neighbours(filled)) & within
+            if grown == filled:
+                return filled
+            filled = grown
+
+    def components(self, mask: int) -> list:
+        """Split the fields in `mask` into connected components,
+        returned as bitmasks."""
+        components = []
+        while mask:
+            component = self._flood(mask & -mask, mask)
+            components.append(component)
+            mask &= ~component
+        return components
+
+    def place(self, mask: int):
+        """Update regions after the fields in `mask` were filled."""
+        for i, region in enumerate(self.regions):
+            if region.mask & mask:
+                break
+        else:
+            return
+
+        self.regions.pop(i)
+        left = region.mask & ~mask
+        # Any new region must border the placed fields
+        seeds = self._neighbours(mask) & left
+        while seeds:
+            part = self._flood(seeds & -seeds, left)
+            self.regions.append(Region(part, self.width))
+            left &= ~part
+            seeds &= ~part
+
+    def unplace(self, mask: int):
+        """Update regions after the fields in `mask` were emptied."""
+        touching = self._neighbours(mask)
+        merged = mask
+        kept = []
+        for region in self.regions:
+            if region.mask & touching:
+                merged |= region.mask
+            else:
+                kept.append(region)
+        kept.append(Region(merged, self.width))
+        self.regions = kept
+
+
+def check_fit_in_span(piece, span) -> bool:
+    """Check whether any possible orientation
+    of `piece` would fit in `span`.
+    """
+    X, Y = span
+    return any(px <= X and py <= Y for px, py in piece.spans)
+
+
+def no_space_left(regions: EmptyRegions, pieces_left: dict, stats=None) -> bool:
+    """Check whether the empty regions cannot accomodate the remaining pieces.
+
+    Assumes that every remaining piece has to be placed. If given, `stats`
+    (a `SearchStats`) counts which rule fired: "region-size" or "piece-span".
+    """
+    pieces = [get_piece(code) for code, n in pieces_left.items() if n > 0]
+
+    # Try to find a region that won't fit any piece (by n empty fields)
+    smallest_piece = min(piece.size for piece in pieces)
+    for region in regions.regions:
+        if smallest_piece > region.size:
+            if stats is not None:
+                stats.prune("region-size")
+            return True
+
+    # Try to find a piece that won't fit in any empty space (by span)
+    for piece in pieces:
+        if not any(check_fit_in_span(piece, region.span) for region in regions.regions):
+            if stats is not None:
+                stats.prune("piece-span")
+            return True
+
+    return False
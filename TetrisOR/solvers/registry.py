@@ -0,0 +1,58 @@
+"""Solvers by name, as run by the batch runner and the benchmarks.
+
+Every solver is a function `solve(G, stats)` that returns a solution,
+or None if the game has none, and may update `stats` (a `SearchStats`).
+"""
+
+import importlib.util
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from solvers.dlx import solve_dlx
+from solvers.heuristic import solve_brute_force
+from solvers.transposition import TranspositionTable
+
+
+def _solve_mip(G, stats):
+    from solvers.mip import solve_mip
+
+    return solve_mip(G, threads=1, stats=stats)
+
+
+SOLVERS = {
+    "heuristic": lambda G, stats: solve_brute_force(G, stats=stats),
+    "heuristic-raster-cell": lambda G, stats: solve_brute_force(
+        G, branching="raster-cell", stats=stats
+    ),
+    "heuristic-min-cell": lambda G, stats: solve_brute_force(
+        G, branching="min-cell", stats=stats
+    ),
+    "heuristic-min-piece": lambda G, stats: solve_brute_force(
+        G, branching="min-piece", stats=stats
+    ),
+    "heuristic-transpositions": lambda G, stats: solve_brute_force(
+        G, stats=stats, transpositions=TranspositionTable()
+    ),
+    "dlx": lambda G, stats: solve_dlx(G, stats=stats),
+}
+if importlib.util.find_spec("ortools") is not None:
+    SOLVERS["mip"] = _solve_mip
+
+
+def register_solver(name: str, solve):
+    """Register a solver under `name`. `solve(G, stats)` must return a
+    solution, or None if the game has none, and may update `stats`."""
+    SOLVERS[name] = solve
+
+
+def peak_rss_kb() -> int:
+    """Return the peak resident set size of this process, in KiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
@@ -0,0 +1,322 @@
+from game import Game
+from utils import Point
+from solvers.pruning import EmptyRegions, no_space_left
+from solvers.solution import SolutionNode
+from solvers.symmetry import board_symmetries, is_canonical, symmetry_breaking_piece
+from solvers.transposition import ZobristHasher
+
+
+class _Frame:
+    """One node on the search stack: the candidates picked by the branching
+    strategy, the index of the one being tried, and its placement, if any."""
+
+    __slots__ = ("candidates", "index", "previous", "key", "placed")
+
+    def __init__(self, candidates, index, previous, key):
+        self.candidates = candidates
+        self.index = index
+        self.previous = previous
+        self.key = key
+        # (code, x, y, orientation, bitmask, SolutionNode) while placed
+        self.placed = None
+
+
+class HeuristicSearch:
+    """Depth-first search engine of the heuristic solver, on an explicit stack.
+
+    Every node picks its candidate placements with `branching`, a function
+    of the game returning a list of (code, x, y, orientation), and tries
+    them in order. The search runs in a loop rather than by recursion, so
+    the depth is not limited by the Python recursion limit, and it can be
+    suspended at any node and resumed later (see `run` and `position`).
+
+    See `solve_brute_force` for `symmetry`, `ordered`, `stats` and
+    `transpositions`. If given, `on_node` is called on entering each node,
+    except while replaying a saved position. With a `RegionSolver` as
+    `decomposition`, a node whose empty fields are split into several
+    regions is solved region by region rather than searched any further.
+    """
+
+    def __init__(
+        self,
+        G: Game,
+        branching,
+        symmetry=True,
+        ordered=False,
+        stats=None,
+        transpositions=None,
+        on_node=None,
+        verbose=False,
+        decomposition=None,
+    ):
+        self.G = G
+        self.branching = branching
+        self.stats = stats
+        self.transpositions = transpositions
+        self.on_node = on_node
+        self.verbose = verbose
+        self.decomposition = decomposition
+        self.nodes = 0
+        self.solution = None
+
+        self._symmetries = board_symmetries(G.grid) if symmetry else []
+        self._restricted = symmetry_breaking_piece(G) if self._symmetries else None
+        self._ordered = ordered
+        self._placed_masks = {code: [] for code in G.pieces_left}
+        self._regions = EmptyRegions(G.grid)
+
+        self._check_no_space_left = self.check_no_space_left
+        if stats is not None:
+            self.branching = stats.timed("branching", branching)
+            self._check_no_space_left = stats.timed(
+                "no_space_left", self.check_no_space_left
+            )
+
+        if transpositions is not None:
+            self._hasher = ZobristHasher(G.grid.size, G.pieces_left)
+            self._state = self._hasher.hash(G.grid.occupied, G.pieces_left)
+            # With ordered identical pieces, what is left to try below a state
+            # also depends on the last placement of each of those pieces
+            self._repeated = [
+                code for code, n in G.pieces_left.items() if n > 1 and ordered
+            ]
+
+        self._stack = []
+        self._replay = None
+        # The root node has yet to be entered
+        self._entering = True
+        self._done = False
+
+    def check_no_space_left(self) -> bool:
+        """Check whether Grid can accomodate any more pieces."""
+        return no_space_left(self._regions, self.G.pieces_left, stats=self.stats)
+
+    def is_redundant(self, code: str, mask: int) -> bool:
+        """Check whether a placement only leads to images of other solutions."""
+        if code == self._restricted and not is_canonical(mask, self._symmetries):
+            return True
+        placed = self._placed_masks[code]
+        return self._ordered and placed and mask <= placed[-1]
+
+    def _state_key(self):
+        if not self._repeated:
+            return self._state
+        return self._state, tuple(
+            self._placed_masks[code][-1] if self._placed_masks[code] else 0
+            for code in self._repeated
+        )
+
+    @property
+    def depth(self) -> int:
+        return len(self._stack)
+
+    @property
+    def finished(self) -> bool:
+        return self._done
+
+    def position(self) -> list:
+        """Return the placements from the root to the current node, as
+        [candidate index, code, x, y, orientation]. Every candidate before
+        the index has been fully explored."""
+        return [
+            [frame.index, *frame.placed[:4]]
+            for frame in self._stack
+            if frame.placed is not None
+        ]
+
+    def resume(self, position: list):
+        """Continue from a `position` saved by an earlier search of the same
+        game with the same options. Must be called before `run`."""
+        if self._stack or not self._entering:
+            raise ValueError("Can only resume a search that has not started")
+        self._replay = position
+
+    def _enter(self, stop=None):
+        """Expand the node reached by the placements on the stack."""
+        G, stats = self.G, self.stats
+        n = len(self._stack)
+        previous = self._stack[-1].placed[5] if self._stack else None
+        self._entering = False
+
+        if self._replay is not None and n >= len(self._replay):
+            self._replay = None
+        # Replayed nodes were counted when the position was saved
+        if self._replay is None:
+            self.nodes += 1
+            if stats is not None:
+                stats.node(n)
+            if self.on_node is not None:
+                self.on_node(self)
+
+        if not any(k > 0 for k in G.pieces_left.values()):
+            # Nothing to place, and nothing to remember either
+            self._stack.append(_Frame([], 0, previous, None))
+            return
+
+        key = None
+        if self.transpositions is not None:
+            key = self._state_key()
+            if key in self.transpositions:
+                if stats is not None:
+                    stats.prune("transposition")
+                self._stack.append(_Frame([], 0, previous, None))
+                return
+
+        if self.verbose:
+            print(f"\nPlacing piece {n}")
+
+        if self._check_no_space_left():
+            if self.verbose:
+                print("No space left")
+            self._stack.append(_Frame([], 0, previous, key))
+            return
+
+        if self.decomposition is not None and len(self._regions.regions) > 1:
+            if self.verbose:
+                print(f"Solving {len(self._regions.regions)} regions separately")
+            placements = self.decomposition.solve(G, depth=n + 1, stop=stop)
+            if self.decomposition.stopped:
+                # The node is entered again when the search is run again
+                self._entering = True
+            elif placements is None:
+                if stats is not None:
+                    stats.prune("decomposition")
+                self._stack.append(_Frame([], 0, previous, key))
+            else:
+                self._complete(placements, previous)
+            return
+
+        candidates = self.branching(G)
+        first = 0
+        if self._replay is not None:
+            # Candidates before the saved one were explored before the
+            # position was saved
+            first, *placement = self._replay[n]
+            if list(candidates[first]) != placement:
+                raise ValueError("Saved position does not match the search")
+        self._stack.append(_Frame(candidates, first, previous, key))
+
+    def _complete(self, placements: list, previous):
+        """Make the placements of a solution of the whole node, one frame each."""
+        G = self.G
+        for code, x, y, ori in placements:
+            at = Point(x, y)
+            G.place(code, at=at, orientation=ori)
+            mask = G.grid.placement_mask(G.history[-1][0])
+            self._regions.place(mask)
+            self._placed_masks[code].append(mask)
+            node = SolutionNode(piece=G._get_piece(code), point=at, orientation=ori)
+            node.previous = previous
+            frame = _Frame([(code, x, y, ori)], 0, previous, None)
+            frame.placed = (code, x, y, ori, mask, node)
+            self._stack.append(frame)
+            previous = node
+        self._done = True
+        self.solution = previous
+
+    def _undo(self, frame: _Frame):
+        """Take back the placement of a frame."""
+        G, stats = self.G, self.stats
+        code, _, _, _, mask, _ = frame.placed
+        G.undo()
+        if stats is not None:
+            stats.backtrack(len(self._stack) - 1)
+        self._regions.unplace(mask)
+        self._placed_masks[code].pop()
+        if self.transpositions is not None:
+            self._state = self._hasher.placement(
+                self._state, mask, code, G.pieces_left[code] - 1
+            )
+        frame.placed = None
+        frame.index += 1
+
+    def _try(self, frame: _Frame) -> bool:
+        """Try the candidates of a frame from its index, and leave the first
+        one that is accepted placed. Return whether one was."""
+        G, stats = self.G, self.stats
+        candidates = frame.candidates
+        while frame.index < len(candidates):
+            code, x, y, ori = candidates[frame.index]
+            at = Point(x, y)
+            placed = G.place(code, at=at, orientation=ori)
+            if stats is not None:
+                stats.attempt(None if placed else G.grid.rejection(code, at, ori))
+            if placed:
+                mask = G.grid.placement_mask(G.history[-1][0])
+                if self.is_redundant(code, mask):
+                    G.undo()
+                    if stats is not None:
+                        stats.rejected["redundant"] += 1
+                    frame.index += 1
+                    continue
+
+                self._regions.place(mask)
+                self._placed_masks[code].append(mask)
+                if self.transpositions is not None:
+                    self._state = self._hasher.placement(
+                        self._state, mask, code, G.pieces_left[code]
+                    )
+                node = SolutionNode(piece=G._get_piece(code), point=at, orientation=ori)
+                node.previous = frame.previous
+                frame.placed = (code, x, y, ori, mask, node)
+                if self.verbose:
+                    print(f"Piece placed! {G.pieces_left} pieces left")
+                    print(G.grid)
+                return True
+
+            frame.index += 1
+        return False
+
+    def run(self, stop=None):
+        """Search until a solution is found, the tree is exhausted, or `stop`
+        returns True; `stop` is called before entering each node, and
+        between the steps of a node solved by `decomposition`, except
+        while replaying a saved position.
+
+        Returns the last `SolutionNode` of the solution, or None otherwise.
+        A stopped search keeps its pieces on the grid, and continues from
+        the same node when run again. Once finished, it stays finished.
+        """
+        stack = self._stack
+        while not self._done:
+            if self._entering:
+                replaying = self._replay is not None and len(stack) < len(self._replay)
+                if stop is not None and not replaying and stop():
+                    return None
+                self._enter(stop)
+                if self._done:
+                    return self.solution
+                if self._entering:
+                    return None
+
+            frame = stack[-1]
+            if frame.placed is not None:
+                self._undo(frame)
+
+            if self._try(frame):
+                if self.G.grid._is_complete():
+                    self._done = True
+                    self.solution = frame.placed[5]
+                    return self.solution
+                self._entering = True
+                continue
+
+            if self.transpositions is not None and frame.key is not None:
+                self.transpositions.add(frame.key)
+            if self.verbose:
+                print(
+                    f"Couldn't place piece {len(stack) - 1}. "
+                    "Rolling back to previous state."
+                )
+            stack.pop()
+            if not stack:
+                self._done = True
+        return None
+
+    def abandon(self):
+        """Take every placement of the search back off the grid."""
+        while self._stack:
+            frame = self._stack.pop()
+            if frame.placed is not None:
+                self.G.undo()
+        self._done = True
@@ -33,6 +33,27 @@ def get_previous_state(node: SolutionNode) -> list:
     return solution
 
 
+def get_solution(node: SolutionNode) -> list:
+    """Return every placement up to and including `node`,
+    in the order the pieces were placed."""
+    solution = []
+    while node is not None:
+        solution.append(node.data)
+        node = node.previous
+    return solution[::-1]
+
+
+def build_chain(placements: list) -> SolutionNode:
+    """Link (piece, point, orientation) placements into a chain of
+    `SolutionNode`s. Return the last node, or None if there are none."""
+    node = None
+    for piece, point, orientation in placements:
+        previous = node
+        node = SolutionNode(piece=piece, point=point, orientation=orientation)
+        node.previous = previous
+    return node
+
+
 def prepopulate_grid(grid_shape: tuple([int, int]), pieces: dict, pieces_placed: list):
     """Build a game grid and piece set from a solution state."""
     grid = Grid(*grid_shape)
@@ -0,0 +1,89 @@
+from time import perf_counter
+
+REJECTIONS = ("out-of-bounds", "collision", "redundant")
+
+
+class SearchStats:
+    """Counters collected by a solver during a search.
+
+    - nodes: search nodes expanded
+    - backtracks: placements taken back after their subtree failed
+    - depths: number of nodes expanded at each depth
+    - attempts: placements tried by the solver
+    - rejected: attempts rejected, by reason (see `REJECTIONS`)
+    - pruned: nodes cut off, by pruning rule
+    - timings: seconds spent in each function wrapped with `timed`
+
+    Solvers only touch the stats when given an instance, so leaving
+    them out costs a single `is None` check per event.
+
+    `on_node(depth)`, `on_backtrack(depth)` and `on_prune(rule)` are
+    optional callbacks, called on every matching event.
+    """
+
+    def __init__(self, on_node=None, on_backtrack=None, on_prune=None):
+        self.nodes = 0
+        self.backtracks = 0
+        self.depths = {}
+        self.attempts = 0
+        self.rejected = {reason: 0 for reason in REJECTIONS}
+        self.pruned = {}
+        self.timings = {}
+        self.on_node = on_node
+        self.on_backtrack = on_backtrack
+        self.on_prune = on_prune
+
+    def node(self, depth: int):
+        """Record a node expanded at `depth`."""
+        self.nodes += 1
+        self.depths[depth] = self.depths.get(depth, 0) + 1
+        if self.on_node is not None:
+            self.on_node(depth)
+
+    def backtrack(self, depth: int):
+        """Record a placement at `depth` taken back."""
+        self.backtracks += 1
+        if self.on_backtrack is not None:
+            self.on_backtrack(depth)
+
+    def attempt(self, rejection: str = None):
+        """Record a placement attempt, and why it was rejected, if it was."""
+        self.attempts += 1
+        if rejection is not None:
+            self.rejected[rejection] += 1
+
+    def prune(self, rule: str):
+        """Record a node cut off by pruning `rule`."""
+        self.pruned[rule] = self.pruned.get(rule, 0) + 1
+        if self.on_prune is not None:
+            self.on_prune(rule)
+
+    def timed(self, name: str, function):
+        """Wrap `function` so that time spent in it adds to `timings[name]`."""
+        timings = self.timings
+        timings.setdefault(name, 0.0)
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings[name] += perf_counter() - start
+
+        return wrapper
+
+    def as_dict(self) -> dict:
+        return {
+            "nodes": self.nodes,
+            "backtracks": self.backtracks,
+            "depths": dict(self.depths),
+            "attempts": self.attempts,
+            "rejected": dict(self.rejected),
+            "pruned": dict(self.pruned),
+            "timings": dict(self.timings),
+        }
+
+    def __repr__(self):
+        return "<SearchStats nodes={} backtracks={}>".format(
+            self.nodes, self.backtracks
+        )
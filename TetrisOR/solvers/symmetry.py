@@ -0,0 +1,64 @@
+from game import Game, Grid
+from pieces import DISTINCT_ORIENTATIONS
+
+
+def _rectangle_transforms(Nx: int, Ny: int) -> list:
+    """Return the non-identity symmetries of an Nx by Ny rectangle,
+    as functions of (x, y)."""
+    transforms = [
+        lambda x, y: (Nx - 1 - x, y),
+        lambda x, y: (x, Ny - 1 - y),
+        lambda x, y: (Nx - 1 - x, Ny - 1 - y),
+    ]
+    if Nx == Ny:
+        transforms += [
+            lambda x, y: (y, x),
+            lambda x, y: (Nx - 1 - y, Ny - 1 - x),
+            lambda x, y: (Nx - 1 - y, x),
+            lambda x, y: (y, Ny - 1 - x),
+        ]
+    return transforms
+
+
+def transform_mask(mask: int, permutation: list) -> int:
+    """Map every set bit `b` of `mask` to bit `permutation[b]`."""
+    image = 0
+    while mask:
+        low = mask & -mask
+        image |= 1 << permutation[low.bit_length() - 1]
+        mask ^= low
+    return image
+
+
+def board_symmetries(grid: Grid) -> list:
+    """Return the non-identity symmetries of the grid that map its
+    occupied fields onto themselves, as bit permutations."""
+    Nx, Ny = grid.shape
+    symmetries = []
+    for transform in _rectangle_transforms(Nx, Ny):
+        permutation = []
+        for b in range(Nx * Ny):
+            x, y = transform(b % Nx, b // Nx)
+            permutation.append(y * Nx + x)
+        if transform_mask(grid.occupied, permutation) == grid.occupied:
+            symmetries.append(permutation)
+    return symmetries
+
+
+def is_canonical(mask: int, symmetries: list) -> bool:
+    """Return whether `mask` is the smallest of its images under `symmetries`."""
+    return all(mask <= transform_mask(mask, p) for p in symmetries)
+
+
+def symmetry_breaking_piece(G: Game):
+    """Pick the piece type to restrict to canonical placements.
+
+    Only a piece type with a single piece left can be restricted, since
+    then every solution has an image under the board symmetries in which
+    that piece sits on a canonical placement. Prefers the piece type with
+    the most distinct orientations. Returns None if there is none.
+    """
+    single = [code for code, n in G.pieces_left.items() if n == 1]
+    if not single:
+        return None
+    return max(single, key=lambda code: len(DISTINCT_ORIENTATIONS[code]))
@@ -0,0 +1,102 @@
+import random
+from collections import OrderedDict
+
+EVICTION_POLICIES = ("lru", "fifo", "none")
+
+
+class ZobristHasher:
+    """Zobrist hashing of search states: the occupied fields of a grid
+    together with the number of pieces left of each type.
+
+    Every field and every (code, count) pair gets a random 64-bit key,
+    and a state hashes to the XOR of the keys it contains. Placing or
+    taking back a piece flips the keys of its fields and of its piece
+    count, so the hash is updated in O(piece size).
+    """
+
+    def __init__(self, n_fields: int, pieces: dict, seed: int = 0):
+        rng = random.Random(seed)
+        self.fields = [rng.getrandbits(64) for _ in range(n_fields)]
+        self.counts = {
+            (code, k): rng.getrandbits(64)
+            for code, n in pieces.items()
+            for k in range(n + 1)
+        }
+        self._masks = {}
+
+    def _mask_key(self, mask: int) -> int:
+        key = self._masks.get(mask)
+        if key is None:
+            key = 0
+            m = mask
+            while m:
+                low = m & -m
+                key ^= self.fields[low.bit_length() - 1]
+                m ^= low
+            self._masks[mask] = key
+        return key
+
+    def hash(self, occupied: int, pieces_left: dict) -> int:
+        """Return the hash of a state from scratch."""
+        h = self._mask_key(occupied)
+        for code, n in pieces_left.items():
+            h ^= self.counts[code, n]
+        return h
+
+    def placement(self, h: int, mask: int, code: str, left: int) -> int:
+        """Return the hash `h` after placing a piece of type `code` on the
+        fields in `mask`, leaving `left` pieces of that type. Calling it
+        again with the same arguments takes the placement back."""
+        return (
+            h
+            ^ self._mask_key(mask)
+            ^ self.counts[code, left]
+            ^ self.counts[code, left + 1]
+        )
+
+
+class TranspositionTable:
+    """Size-capped set of search states known to be dead ends.
+
+    Once `max_size` states are stored, `eviction` decides what happens
+    to the next one:
+    - "lru": drop the least recently stored or matched state
+    - "fifo": drop the oldest stored state
+    - "none": keep the table as it is and drop the new state
+    """
+
+    def __init__(self, max_size: int = 1_000_000, eviction: str = "lru"):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.max_size = max_size
+        self.eviction = eviction
+        self._states = OrderedDict()
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._states)
+
+    def __contains__(self, key) -> bool:
+        if key not in self._states:
+            return False
+        self.hits += 1
+        if self.eviction == "lru":
+            self._states.move_to_end(key)
+        return True
+
+    def add(self, key):
+        """Store a dead-end state, evicting another one if the table is full."""
+        if key in self._states:
+            return
+        if len(self._states) >= self.max_size:
+            if self.eviction == "none" or not self._states:
+                return
+            self._states.popitem(last=False)
+            self.evictions += 1
+        self._states[key] = None
+        self.stores += 1
+
+    def clear(self):
+        self._states.clear()
@@ -0,0 +1,5 @@
+import os
+
+# Keep the test suite from writing placement indexes to a user's cache;
+# tests of the disk cache pass their own directory
+os.environ.pop("TETRISOR_CACHE", None)
@@ -0,0 +1,86 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from batch import iter_batch, run_batch
+from benchmarks.catalog import get_instance, make_game
+from serialization import puzzle_to_dict
+from solvers.registry import SOLVERS, register_solver
+
+
+def solve_unless_large(G, stats):
+    """Solve boards of up to 20 fields, and never finish larger ones."""
+    if G.grid.size > 20:
+        time.sleep(60)
+    return SOLVERS["dlx"](G, stats)
+
+
+def puzzle(name):
+    return puzzle_to_dict(make_game(get_instance(name)))
+
+
+class Test_iter_batch(unittest.TestCase):
+    def test_statuses(self):
+        puzzles = [
+            ("demo", puzzle("demo-5x3")),
+            ("teal", puzzle("teal-4x3-unsolvable")),
+            ("bad", {"grid_shape": [3, 3], "pieces": {"XX": 1}}),
+        ]
+        results = {r["id"]: r for r in iter_batch(puzzles, solver="dlx", workers=2)}
+        self.assertEqual(results["demo"]["status"], "solved")
+        self.assertEqual(len(results["demo"]["solution"]), 3)
+        self.assertGreater(results["demo"]["stats"]["nodes"], 0)
+        self.assertEqual(results["teal"]["status"], "unsolvable")
+        self.assertEqual(results["bad"]["status"], "error")
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "Worker processes need to inherit the test solver",
+    )
+    def test_timeout_does_not_stall_batch(self):
+        register_solver("sleepy", solve_unless_large)
+        self.addCleanup(SOLVERS.pop, "sleepy")
+        puzzles = [("slow", puzzle("full-11x5")), ("demo", puzzle("demo-5x3"))]
+        results = list(iter_batch(puzzles, solver="sleepy", workers=2, timeout=1))
+        statuses = {r["id"]: r["status"] for r in results}
+        self.assertEqual(statuses, {"slow": "timeout", "demo": "solved"})
+        # The quick puzzle finishes first
+        self.assertEqual(results[0]["id"], "demo")
+
+
+class Test_run_batch(unittest.TestCase):
+    def test_streams_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "puzzles.jsonl")
+            target = os.path.join(directory, "results.jsonl")
+            with open(source, "w") as f:
+                for name in ("demo-5x3", "square-4x4"):
+                    f.write(json.dumps(dict(puzzle(name), id=name)) + "\n")
+
+            counts = run_batch(source, target, solver="dlx", workers=1)
+            with open(target) as f:
+                results = [json.loads(line) for line in f]
+
+        self.assertEqual(counts, {"solved": 2})
+        self.assertEqual([r["id"] for r in results], ["demo-5x3", "square-4x4"])
+
+    def test_malformed_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "puzzles.jsonl")
+            target = os.path.join(directory, "results.jsonl")
+            with open(source, "w") as f:
+                f.write('{"grid_shape": [5, 3], "pieces": \n')
+                f.write("[1, 2]\n")
+                f.write(json.dumps(dict(puzzle("demo-5x3"), id="demo")) + "\n")
+
+            counts = run_batch(source, target, solver="dlx", workers=1)
+            with open(target) as f:
+                results = {r["id"]: r for r in map(json.loads, f)}
+
+        self.assertEqual(counts, {"error": 2, "solved": 1})
+        self.assertEqual(results[1]["status"], "error")
+        self.assertEqual(results[2]["status"], "error")
+        self.assertEqual(results["demo"]["status"], "solved")
@@ -0,0 +1,57 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.catalog import INSTANCES, make_game
+from benchmarks.run import FIELDS, run_one, write_results
+
+
+class Test_catalog(unittest.TestCase):
+    def test_every_instance_builds(self):
+        for instance in INSTANCES:
+            G = make_game(instance)
+            self.assertEqual(len(G.history), len(instance["placed"]))
+
+    def test_names_are_unique(self):
+        names = [instance["name"] for instance in INSTANCES]
+        self.assertEqual(len(names), len(set(names)))
+
+
+class Test_run_one(unittest.TestCase):
+    def test_solved_record(self):
+        record = run_one("demo-5x3", "dlx", timeout=30)
+        self.assertEqual(record["status"], "solved")
+        self.assertGreater(record["nodes"], 0)
+        self.assertIsNotNone(record["wall_time"])
+        self.assertLessEqual(set(FIELDS), set(record))
+
+    def test_unsolvable_record(self):
+        record = run_one("teal-4x3-unsolvable", "heuristic", timeout=30)
+        self.assertEqual(record["status"], "unsolvable")
+
+    def test_timeout_record(self):
+        record = run_one("full-11x5", "heuristic", timeout=0.01)
+        self.assertEqual(record["status"], "timeout")
+
+
+class Test_write_results(unittest.TestCase):
+    def setUp(self):
+        self.records = [{field: None for field in FIELDS}]
+        self.records[0].update(instance="demo-5x3", solver="dlx", status="solved")
+
+    def test_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            write_results(self.records, path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["results"], self.records)
+
+    def test_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            write_results(self.records, path)
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]["status"], "solved")
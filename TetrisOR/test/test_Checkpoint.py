@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.catalog import get_instance, make_game
+from solvers.checkpoint import Checkpoint
+from solvers.heuristic import solve_brute_force
+from solvers.solution import get_solution
+
+
+def placements(solution):
+    return [(piece.code, tuple(point), o) for piece, point, o in get_solution(solution)]
+
+
+def stop_after(n):
+    count = [0]
+
+    def stop():
+        count[0] += 1
+        return count[0] > n
+
+    return stop
+
+
+class Test_Checkpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "search.ckpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_due(self):
+        checkpoint = Checkpoint(self.path, every_nodes=10)
+        self.assertFalse(checkpoint.due(9))
+        self.assertTrue(checkpoint.due(10))
+        checkpoint.save({}, nodes=10)
+        self.assertFalse(checkpoint.due(15))
+        self.assertTrue(Checkpoint(self.path, every_seconds=0).due(0))
+
+    def test_resume_finds_same_solution(self):
+        expected = placements(solve_brute_force(make_game(get_instance("medium-6x5"))))
+
+        G = make_game(get_instance("medium-6x5"))
+        checkpoint = Checkpoint(self.path, every_nodes=20)
+        rounds = 0
+        while True:
+            solution = solve_brute_force(G, stop=stop_after(100), checkpoint=checkpoint)
+            rounds += 1
+            if solution is not None:
+                break
+            # An interrupted search leaves the grid as it found it
+            self.assertEqual(G.grid.occupied, 0)
+            self.assertIsNotNone(checkpoint.load())
+
+        self.assertGreater(rounds, 1)
+        self.assertEqual(placements(solution), expected)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_rejects_other_search(self):
+        G = make_game(get_instance("medium-6x5"))
+        checkpoint = Checkpoint(self.path)
+        solve_brute_force(G, stop=stop_after(50), checkpoint=checkpoint)
+        with self.assertRaises(ValueError):
+            solve_brute_force(G, branching="raster-cell", checkpoint=checkpoint)
+        with self.assertRaises(ValueError):
+            solve_brute_force(
+                make_game(get_instance("demo-5x3")), checkpoint=checkpoint
+            )
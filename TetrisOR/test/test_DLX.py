@@ -0,0 +1,71 @@
+import unittest
+
+from game import Game
+from pieces import COLORS, EmeraldGreen, MintGreen, Yellow
+from solvers.dlx import ExactCover, iter_exact_covers, solve_dlx
+from solvers.solution import get_previous_state
+
+
+def placements(node):
+    return [node.data] + get_previous_state(node)
+
+
+class Test_ExactCover(unittest.TestCase):
+    def test_knuth_example(self):
+        # Example from Knuth's "Dancing Links" paper; unique cover is rows 0, 3, 4
+        matrix = ExactCover(n_primary=7, capacities=[])
+        rows = [[3, 5, 6], [1, 4, 7], [2, 3, 6], [1, 4], [2, 7], [4, 5, 7]]
+        for i, row in enumerate(rows):
+            matrix.add_row(row, data=i)
+        self.assertEqual([sorted(s) for s in matrix.search()], [[0, 3, 4]])
+
+    def test_secondary_column_capacity(self):
+        # Two rows share a secondary column with capacity 1
+        matrix = ExactCover(n_primary=2, capacities=[1])
+        matrix.add_row([1, 3], data="a")
+        matrix.add_row([2, 3], data="b")
+        matrix.add_row([1, 2], data="c")
+        self.assertEqual(list(matrix.search()), [["c"]])
+
+
+class Test_solve_dlx(unittest.TestCase):
+    def setUp(self):
+        self.pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+
+    def test_finds_all_solutions(self):
+        G = Game(grid_shape=(5, 3), pieces=self.pieces)
+        self.assertEqual(len(solve_dlx(G, find_all=True)), 4)
+        self.assertFalse(G.grid._is_complete())
+
+    def test_first_solution_is_placed(self):
+        G = Game(grid_shape=(5, 3), pieces=self.pieces)
+        solution = solve_dlx(G)
+        self.assertTrue(G.grid._is_complete())
+        self.assertEqual(len(placements(solution)), 3)
+
+    def test_solutions_are_valid_placements(self):
+        for solution in iter_exact_covers(Game(grid_shape=(5, 3), pieces=self.pieces)):
+            G = Game(grid_shape=(5, 3), pieces=self.pieces)
+            for piece, point, orientation in placements(solution):
+                self.assertTrue(G.place(piece.code, at=point, orientation=orientation))
+            self.assertTrue(G.grid._is_complete())
+
+    def test_duplicate_pieces_not_permuted(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        self.assertEqual(len(solve_dlx(G, find_all=True)), 2)
+
+    def test_unsolvable(self):
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        self.assertIsNone(solve_dlx(G))
+
+    def test_full_board(self):
+        G = Game(grid_shape=(11, 5), pieces={piece.code: 1 for piece in COLORS})
+        self.assertIsNotNone(solve_dlx(G))
+        self.assertTrue(G.grid._is_complete())
+
+    def test_symmetry_keeps_one_solution_per_orbit(self):
+        G = Game(grid_shape=(5, 3), pieces=self.pieces)
+        self.assertEqual(len(solve_dlx(G, find_all=True, symmetry=True)), 1)
+        G = Game(grid_shape=(5, 4), pieces={"CY": 2, "TE": 2, "AB": 1, "RE": 1})
+        self.assertEqual(len(solve_dlx(G, find_all=True)), 12)
+        self.assertEqual(len(solve_dlx(G, find_all=True, symmetry=True)), 3)
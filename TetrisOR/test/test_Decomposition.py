@@ -0,0 +1,147 @@
+import unittest
+
+from benchmarks.catalog import FULL_BOARD_SOLUTION, INSTANCES, make_game
+from game import Game
+from pieces import COLORS
+from solvers.decomposition import RegionSolver, sub_multisets
+from solvers.heuristic import (
+    BRANCHING_STRATEGIES,
+    branch_first_piece,
+    solve_brute_force,
+)
+from solvers.pruning import EmptyRegions
+from solvers.search import HeuristicSearch
+from solvers.stats import SearchStats
+from utils import Point
+
+ALL_PIECES = {piece.code: 1 for piece in COLORS}
+SIZES = {piece.code: piece.size for piece in COLORS}
+
+
+def split_board(**pieces):
+    """Return the full board with a hole of 4 fields cut off from the rest."""
+    placed = [FULL_BOARD_SOLUTION[i] for i in (0, 1, 2, 5, 6)]
+    return Game((11, 5), pieces=dict(ALL_PIECES, **pieces), placed=placed)
+
+
+class Test_sub_multisets(unittest.TestCase):
+    def test_every_split_is_exact(self):
+        pieces = (("AB", 2), ("CY", 2), ("IN", 1))
+        splits = list(sub_multisets(pieces, 7))
+        for part, rest in splits:
+            self.assertEqual(sum(SIZES[c] * n for c, n in part), 7)
+            merged = dict(rest)
+            for code, n in part:
+                merged[code] = merged.get(code, 0) + n
+            self.assertEqual(merged, dict(pieces))
+        self.assertCountEqual([part for part, _ in splits], [(("CY", 1), ("IN", 1))])
+
+    def test_nothing_fits(self):
+        self.assertEqual(list(sub_multisets((("AB", 3),), 7)), [])
+
+
+class Test_RegionSolver(unittest.TestCase):
+    def test_fills_every_region(self):
+        G = split_board()
+        self.assertEqual(len(EmptyRegions(G.grid).regions), 2)
+        placements = RegionSolver(G.grid.shape).solve(G)
+        self.assertIsNotNone(placements)
+        for code, x, y, ori in placements:
+            self.assertTrue(G.place(code, at=Point(x, y), orientation=ori))
+        self.assertTrue(G.grid._is_complete())
+
+    def test_unfillable_region(self):
+        # The hole of 4 fields only fits TE
+        G = split_board(TE=0, IN=2)
+        self.assertIsNone(RegionSolver(G.grid.shape).solve(G))
+
+    def test_memoized(self):
+        G = split_board()
+        stats = SearchStats()
+        solver = RegionSolver(G.grid.shape, stats=stats)
+        first = solver.solve(G)
+        nodes = stats.nodes
+        self.assertEqual(solver.solve(G), first)
+        self.assertEqual(stats.nodes, nodes)
+        self.assertGreater(solver.hits, 0)
+
+    def test_uses_branching(self):
+        G = split_board()
+        calls = []
+
+        def branching(index, occupied, pieces_left):
+            calls.append(dict(pieces_left))
+            return []
+
+        solver = RegionSolver(G.grid.shape, branching=branching)
+        self.assertIsNone(solver.solve(G))
+        self.assertTrue(calls)
+        for pieces_left in calls:
+            self.assertLessEqual(pieces_left.keys(), G.pieces_left.keys())
+
+    def test_memo_size(self):
+        G = split_board()
+        solver = RegionSolver(G.grid.shape, memo_size=3)
+        self.assertIsNotNone(solver.solve(G))
+        self.assertLessEqual(len(solver.memo), 3)
+
+    def test_stop(self):
+        G = split_board()
+        solver = RegionSolver(G.grid.shape)
+        budget = [20]
+
+        def stop():
+            budget[0] -= 1
+            return budget[0] < 0
+
+        self.assertIsNone(solver.solve(G, stop=stop))
+        self.assertTrue(solver.stopped)
+        self.assertIsNotNone(solver.solve(G))
+        self.assertFalse(solver.stopped)
+
+
+class Test_DecomposedSearch(unittest.TestCase):
+    def test_same_outcome_as_plain_search(self):
+        for instance in INSTANCES[:8]:
+            for branching in BRANCHING_STRATEGIES:
+                with self.subTest(instance=instance["name"], branching=branching):
+                    solved = []
+                    for decomposition in (False, True):
+                        G = make_game(instance)
+                        solution = solve_brute_force(
+                            G, branching=branching, decomposition=decomposition
+                        )
+                        solved.append(solution is not None)
+                        if solution is not None:
+                            self.assertTrue(G.grid._is_complete())
+                    self.assertEqual(solved[0], solved[1])
+
+    def test_suspend_and_continue(self):
+        G = split_board()
+        search = HeuristicSearch(
+            G, branch_first_piece, decomposition=RegionSolver(G.grid.shape)
+        )
+        runs = 0
+        while not search.finished:
+            budget = [20]
+
+            def stop():
+                budget[0] -= 1
+                return budget[0] < 0
+
+            solution = search.run(stop=stop)
+            runs += 1
+
+        self.assertGreater(runs, 1)
+        self.assertIsNotNone(solution)
+        self.assertTrue(G.grid._is_complete())
+
+    def test_split_board_without_search(self):
+        stats = SearchStats()
+        G = split_board(TE=0, IN=2)
+        self.assertIsNone(solve_brute_force(G, stats=stats, propagation=False))
+        self.assertEqual(stats.pruned["decomposition"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
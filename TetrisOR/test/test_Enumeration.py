@@ -0,0 +1,63 @@
+import unittest
+
+from game import Game
+from pieces import COLORS, EmeraldGreen, MintGreen, Yellow
+from solvers.dlx import solve_dlx
+from solvers.enumeration import count_solutions, iter_solutions
+from utils import Point
+
+
+def demo_game():
+    pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+    return Game(grid_shape=(5, 3), pieces=pieces)
+
+
+class Test_iter_solutions(unittest.TestCase):
+    def test_matches_dlx(self):
+        G = demo_game()
+        solutions = list(iter_solutions(G))
+        self.assertEqual(len(solutions), len(solve_dlx(demo_game(), find_all=True)))
+        self.assertEqual(G.grid.occupied, 0)
+
+    def test_solutions_are_compact_placements(self):
+        G = demo_game()
+        for solution in iter_solutions(G):
+            for code, x, y, orientation in solution:
+                G.place(code, at=Point(x, y), orientation=orientation)
+            self.assertTrue(G.grid._is_complete())
+            while G.history:
+                G.undo()
+
+    def test_limit(self):
+        self.assertEqual(len(list(iter_solutions(demo_game(), limit=2))), 2)
+        self.assertEqual(list(iter_solutions(demo_game(), limit=0)), [])
+
+    def test_unique_modulo_symmetry(self):
+        # The 4 solutions of the demo are images of a single one
+        self.assertEqual(len(list(iter_solutions(demo_game(), unique=True))), 1)
+
+        # Identical pieces: no piece can be restricted to canonical placements
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        self.assertEqual(len(list(iter_solutions(G))), 2)
+        self.assertEqual(len(list(iter_solutions(G, unique=True))), 1)
+
+    def test_unique_medium_board(self):
+        G = Game(grid_shape=(6, 5), pieces={piece.code: 1 for piece in COLORS[:7]})
+        self.assertEqual(count_solutions(G), 292)
+        # The 6x5 board has 3 symmetries, and no solution is its own image
+        self.assertEqual(count_solutions(G, unique=True), 73)
+
+
+class Test_count_solutions(unittest.TestCase):
+    def test_counts(self):
+        self.assertEqual(count_solutions(demo_game()), 4)
+        self.assertEqual(count_solutions(demo_game(), unique=True), 1)
+
+    def test_unsolvable(self):
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        self.assertEqual(count_solutions(G), 0)
+
+    def test_limit(self):
+        self.assertEqual(count_solutions(demo_game(), limit=2), 2)
+        self.assertEqual(count_solutions(demo_game(), limit=10), 4)
+        self.assertEqual(count_solutions(demo_game(), unique=True, limit=2), 1)
@@ -0,0 +1,45 @@
+import unittest
+
+from game import Game
+from utils import Point
+
+
+class Test_Game_place(unittest.TestCase):
+    def test_place_decrements_pieces_left(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        self.assertTrue(G.place("CY", at=Point(0, 0)))
+        self.assertEqual(G.pieces_left, {"CY": 1})
+        self.assertEqual(len(G.history), 1)
+
+    def test_check_does_not_place(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        self.assertTrue(G.place("CY", at=Point(0, 0), check=True))
+        self.assertEqual(G.pieces_left, {"CY": 2})
+        self.assertEqual(G.grid.occupied, 0)
+        self.assertEqual(G.history, [])
+
+    def test_no_pieces_left(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 0})
+        self.assertFalse(G.place("CY", at=Point(0, 0)))
+
+
+class Test_Game_undo(unittest.TestCase):
+    def test_undo_restores_state(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        G.place("CY", at=Point(0, 0))
+        occupied = G.grid.occupied
+        G.place("CY", at=Point(2, 1), orientation=3)
+
+        piece, point, orientation = G.undo()
+        self.assertEqual(piece.code, "CY")
+        self.assertEqual((point.x, point.y, orientation), (2, 1, 3))
+        self.assertEqual(G.grid.occupied, occupied)
+        self.assertEqual(G.pieces_left, {"CY": 1})
+
+    def test_undo_everything(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        G.place("CY", at=Point(0, 0))
+        G.undo()
+        self.assertEqual(G.grid.occupied, 0)
+        self.assertEqual(G.grid.pieces, [])
+        self.assertIsNone(G.undo())
@@ -0,0 +1,85 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from game import Game
+from generator import (
+    generate_board,
+    is_unique,
+    iter_boards,
+    random_tiling,
+    run_generator,
+)
+from serialization import puzzle_from_dict, puzzle_to_dict
+from solvers.enumeration import count_solutions
+
+SHAPE = (5, 4)
+PIECES = {"CY": 1, "IN": 1, "MR": 1, "TE": 1, "AB": 1}
+
+
+class Test_random_tiling(unittest.TestCase):
+    def test_tiles_the_grid(self):
+        for seed in range(3):
+            placed = random_tiling(SHAPE, PIECES, random.Random(seed))
+            G = Game(SHAPE, pieces=PIECES, placed=placed)
+            self.assertTrue(G.grid._is_complete())
+
+    def test_no_tiling(self):
+        self.assertIsNone(random_tiling((4, 3), {"TE": 3}, random.Random(0)))
+
+
+class Test_generate_board(unittest.TestCase):
+    def test_unique_solution(self):
+        placed = generate_board(SHAPE, PIECES, difficulty=2, seed=0)
+        self.assertEqual(len(placed), 3)
+        self.assertTrue(is_unique(SHAPE, PIECES, placed))
+        G = Game(SHAPE, pieces=PIECES, placed=placed)
+        self.assertEqual(count_solutions(G), 1)
+
+    def test_same_seed_same_board(self):
+        self.assertEqual(
+            generate_board(SHAPE, PIECES, difficulty=2, seed=7),
+            generate_board(SHAPE, PIECES, difficulty=2, seed=7),
+        )
+
+    def test_too_difficult(self):
+        # The empty grid has several solutions
+        self.assertIsNone(generate_board(SHAPE, PIECES, difficulty=5, seed=0))
+
+
+class Test_iter_boards(unittest.TestCase):
+    def test_distinct_boards(self):
+        boards = list(iter_boards(3, SHAPE, PIECES, difficulty=2, workers=2))
+        self.assertEqual(len(boards), 3)
+        keys = {json.dumps(puzzle_to_dict(G)) for _, G in boards}
+        self.assertEqual(len(keys), 3)
+        seeds = [seed for seed, _ in boards]
+        self.assertEqual(seeds, sorted(seeds))
+
+    def test_gives_up(self):
+        boards = iter_boards(1, SHAPE, PIECES, difficulty=5, workers=2, attempts=4)
+        self.assertEqual(list(boards), [])
+
+
+class Test_run_generator(unittest.TestCase):
+    def test_streams_boards(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.jsonl")
+            written = run_generator(
+                path, 2, grid_shape=SHAPE, pieces=PIECES, difficulty=2, workers=2
+            )
+            with open(path) as f:
+                boards = [json.loads(line) for line in f]
+
+        self.assertEqual(written, 2)
+        for board in boards:
+            self.assertEqual(board["difficulty"], 2)
+            G = puzzle_from_dict(board)
+            self.assertEqual(sum(G.pieces_left.values()), 2)
+            self.assertEqual(count_solutions(G, limit=2), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
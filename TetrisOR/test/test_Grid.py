@@ -0,0 +1,174 @@
+import importlib.util
+import random
+import unittest
+
+from game import Grid
+from pieces import COLORS, DISTINCT_ORIENTATIONS, Cyan, Red
+from utils import Point
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class Test_Grid_bitboard(unittest.TestCase):
+    def test_empty_grid_has_no_occupied_fields(self):
+        grid = Grid(3, 2)
+        self.assertEqual(grid.occupied, 0)
+        self.assertFalse(grid._is_complete())
+
+    def test_place_sets_occupied_bits(self):
+        grid = Grid(3, 2)
+        self.assertTrue(grid.place(Cyan(), Point(0, 0)))
+        # Cyan base orientation covers (0, 0), (0, 1), (1, 1)
+        expected = (1 << 0) | (1 << 3) | (1 << 4)
+        self.assertEqual(grid.occupied, expected)
+
+    def test_place_sets_field_nodes(self):
+        grid = Grid(3, 2)
+        piece = Cyan()
+        grid.place(piece, Point(0, 0))
+        self.assertEqual(grid[0, 1].node, (piece, 1))
+        self.assertEqual(grid[2, 0].node, (None, None))
+
+    def test_check_placement_returns_node_points(self):
+        grid = Grid(3, 2)
+        nodes = grid.check_placement(Cyan(), Point(1, 0))
+        self.assertEqual(
+            {n: (p.x, p.y) for n, p in nodes.items()},
+            {0: (1, 0), 1: (1, 1), 2: (2, 1)},
+        )
+
+    def test_check_placement_out_of_bounds(self):
+        grid = Grid(3, 2)
+        self.assertEqual(grid.check_placement(Cyan(), Point(2, 0)), {})
+        self.assertEqual(grid.check_placement(Cyan(), Point(0, -1)), {})
+        self.assertEqual(grid.check_placement(Red(), Point(0, 0)), {})
+
+    def test_check_placement_collision(self):
+        grid = Grid(3, 2)
+        grid.place(Cyan(), Point(0, 0))
+        self.assertEqual(grid.check_placement(Cyan(), Point(1, 0)), {})
+        self.assertFalse(grid.place(Cyan(), Point(1, 0)))
+
+    def test_is_complete(self):
+        grid = Grid(3, 2)
+        grid.place(Cyan(orientation=1), Point(0, 0))
+        grid.place(Cyan(orientation=3), Point(2, 1))
+        self.assertTrue(grid._is_complete())
+
+
+class Test_Grid_unplace(unittest.TestCase):
+    def test_unplace_clears_fields_and_bits(self):
+        grid = Grid(3, 2)
+        first, second = Cyan(), Cyan(orientation=3)
+        grid.place(first, Point(0, 0))
+        occupied = grid.occupied
+        grid.place(second, Point(2, 1))
+
+        self.assertTrue(grid.unplace(second))
+        self.assertEqual(grid.occupied, occupied)
+        self.assertEqual(grid[2, 1].node, (None, None))
+        self.assertEqual(grid.pieces, [first])
+
+    def test_unplace_out_of_order(self):
+        grid = Grid(3, 2)
+        first, second = Cyan(), Cyan(orientation=3)
+        grid.place(first, Point(0, 0))
+        grid.place(second, Point(2, 1))
+
+        self.assertTrue(grid.unplace(first))
+        self.assertEqual(grid.pieces, [second])
+        self.assertTrue(grid.place(Cyan(), Point(0, 0)))
+
+    def test_unplace_missing_piece(self):
+        grid = Grid(3, 2)
+        self.assertFalse(grid.unplace(Cyan()))
+
+
+class Test_Grid_rejection(unittest.TestCase):
+    def test_reasons(self):
+        grid = Grid(3, 2)
+        self.assertIsNone(grid.rejection("CY", Point(0, 0)))
+        self.assertEqual(grid.rejection("CY", Point(2, 0)), "out-of-bounds")
+        grid.place(Cyan(), Point(0, 0))
+        self.assertEqual(grid.rejection("CY", Point(0, 0)), "collision")
+
+
+class Test_Grid_storage(unittest.TestCase):
+    def test_index_out_of_bounds(self):
+        grid = Grid(3, 2)
+        for x, y in [(-1, 0), (0, -1), (3, 0), (0, 2)]:
+            with self.assertRaises(IndexError):
+                grid[x, y]
+
+    def test_field_view(self):
+        grid = Grid(3, 2)
+        piece = Cyan()
+        grid[2, 1].node = (piece, 0)
+        self.assertEqual(grid[2, 1].node, (piece, 0))
+        self.assertEqual(tuple(grid[2, 1].point), (2, 1))
+        grid[2, 1].node = (None, None)
+        self.assertEqual(grid[2, 1].node, (None, None))
+
+    def test_slots_are_reused(self):
+        grid = Grid(3, 2)
+        first, second = Cyan(), Cyan(orientation=3)
+        grid.place(first, Point(0, 0))
+        grid.unplace(first)
+        grid.place(second, Point(2, 1))
+        self.assertEqual(len(grid._slot_pieces), 2)
+        self.assertEqual(grid[2, 1].node, (second, 0))
+
+    def test_copy_is_independent(self):
+        grid = Grid(3, 2)
+        piece = Cyan()
+        grid.place(piece, Point(0, 0))
+        other = grid.copy()
+        other.unplace(piece)
+        self.assertEqual(grid[0, 1].node, (piece, 1))
+        self.assertEqual(other[0, 1].node, (None, None))
+        self.assertNotEqual(grid.occupied, other.occupied)
+
+    def test_large_grid(self):
+        # More than 127 fields need wider slot ids
+        grid = Grid(20, 10)
+        piece = Cyan()
+        self.assertTrue(grid.place(piece, Point(18, 8)))
+        self.assertEqual(grid[18, 9].node, (piece, 1))
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class Test_Grid_arrays(unittest.TestCase):
+    def test_occupancy(self):
+        grid = Grid(3, 2)
+        grid.place(Cyan(), Point(0, 0))
+        occupancy = grid.occupancy()
+        self.assertEqual(occupancy.shape, (3, 2))
+        self.assertEqual(
+            occupancy.tolist(), [[True, True], [False, True], [False, False]]
+        )
+
+    def test_feasible_anchors_match_can_place(self):
+        random.seed(0)
+        for _ in range(20):
+            Nx, Ny = random.randint(1, 9), random.randint(1, 6)
+            grid = Grid(Nx, Ny)
+            for _ in range(4):
+                P = random.choice(COLORS)
+                piece = P(orientation=random.choice(P.valid_orientations))
+                grid.place(piece, Point(random.randrange(Nx), random.randrange(Ny)))
+
+            for code, orientations in DISTINCT_ORIENTATIONS.items():
+                for orientation in orientations:
+                    feasible = grid.feasible_anchors(code, orientation)
+                    self.assertEqual(feasible.shape, (Nx, Ny))
+                    expected = [
+                        [
+                            grid.can_place(code, Point(x, y), orientation)
+                            for y in range(Ny)
+                        ]
+                        for x in range(Nx)
+                    ]
+                    self.assertEqual(feasible.tolist(), expected)
+
+    def test_piece_larger_than_grid(self):
+        self.assertFalse(Grid(2, 2).feasible_anchors("AB", 1).any())
@@ -0,0 +1,94 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from game import Game
+from pieces import COLORS, EmeraldGreen, MintGreen, Yellow
+from solvers.heuristic import (
+    BRANCHING_STRATEGIES,
+    branch_min_cell,
+    branch_raster_cell,
+    solve_brute_force,
+)
+
+
+def solve_quietly(G, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        return solve_brute_force(G, **kwargs)
+
+
+class Test_solve_brute_force(unittest.TestCase):
+    def test_solves_demo(self):
+        pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        solution = solve_quietly(G)
+        self.assertIsNotNone(solution)
+        self.assertTrue(G.grid._is_complete())
+        self.assertEqual(len(G.history), 3)
+
+    def test_unsolvable_leaves_grid_empty(self):
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        self.assertIsNone(solve_quietly(G))
+        self.assertEqual(G.grid.occupied, 0)
+        self.assertEqual(G.pieces_left, G.n_pieces)
+
+
+class Test_branching_strategies(unittest.TestCase):
+    def test_every_strategy_solves_demo(self):
+        pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+        for name in BRANCHING_STRATEGIES:
+            G = Game(grid_shape=(5, 3), pieces=pieces)
+            self.assertIsNotNone(solve_quietly(G, branching=name), name)
+            self.assertTrue(G.grid._is_complete(), name)
+
+    def test_every_strategy_rejects_unsolvable(self):
+        pieces = {"CY": 2, "IN": 1, "MR": 1, "TE": 1}
+        for name in BRANCHING_STRATEGIES:
+            G = Game(grid_shape=(4, 4), pieces=pieces)
+            self.assertIsNone(solve_quietly(G, branching=name), name)
+            self.assertEqual(G.grid.occupied, 0, name)
+
+    def test_min_cell_solves_full_board(self):
+        G = Game(grid_shape=(11, 5), pieces={piece.code: 1 for piece in COLORS})
+        self.assertIsNotNone(solve_quietly(G, branching="min-cell"))
+
+    def test_min_cell_branches_on_forced_field(self):
+        # Corners of a 3x2 grid are covered by 3 Cyan placements,
+        # the fields in the middle column by 6
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        candidates = branch_min_cell(G)
+        self.assertEqual(len(candidates), 3)
+
+    def test_custom_strategy(self):
+        calls = []
+
+        def strategy(G):
+            calls.append(G)
+            return branch_raster_cell(G)
+
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        self.assertIsNotNone(solve_quietly(G, branching=strategy))
+        self.assertTrue(calls)
+
+
+class Test_symmetry_breaking(unittest.TestCase):
+    def test_duplicate_pieces_still_solvable(self):
+        for name in BRANCHING_STRATEGIES:
+            G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+            self.assertIsNotNone(solve_quietly(G, branching=name), name)
+
+    def test_same_result_with_and_without_symmetry(self):
+        cases = [
+            ((5, 4), {"CY": 1, "IN": 1, "MR": 1, "TE": 1, "AB": 1}),
+            ((4, 4), {"CY": 1, "IN": 1, "MR": 1, "AB": 1}),
+            ((4, 3), {"TE": 3}),
+            ((5, 3), {"MI": 1, "EG": 1, "YE": 1}),
+        ]
+        for shape, pieces in cases:
+            for name in ("raster-cell", "min-piece"):
+                results = []
+                for symmetry in (False, True):
+                    G = Game(grid_shape=shape, pieces=pieces)
+                    solution = solve_quietly(G, branching=name, symmetry=symmetry)
+                    results.append(solution is not None)
+                self.assertEqual(results[0], results[1], (shape, name))
@@ -0,0 +1,38 @@
+import importlib.util
+import unittest
+
+from game import Game
+from pieces import EmeraldGreen, MintGreen, Yellow
+
+HAS_ORTOOLS = importlib.util.find_spec("ortools") is not None
+
+
+@unittest.skipUnless(HAS_ORTOOLS, "OR-Tools not installed")
+class Test_solve_mip(unittest.TestCase):
+    def test_solves_demo(self):
+        from solvers.mip import solve_mip
+
+        pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        solution = solve_mip(G, time_limit=10, threads=1)
+        self.assertIsNotNone(solution)
+        self.assertTrue(G.grid._is_complete())
+
+    def test_unsolvable(self):
+        from solvers.mip import solve_mip
+
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        self.assertIsNone(solve_mip(G, time_limit=10))
+        self.assertEqual(G.grid.occupied, 0)
+
+    def test_threads(self):
+        from solvers.mip import solve_mip
+
+        pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        self.assertIsNotNone(solve_mip(G, backend="SAT", threads=2))
+        self.assertTrue(G.grid._is_complete())
+
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        with self.assertRaises(ValueError):
+            solve_mip(G, backend="CBC", threads=2)
@@ -0,0 +1,56 @@
+import unittest
+
+from benchmarks.catalog import get_instance, make_game
+from game import Game
+from pieces import EmeraldGreen, MintGreen, Yellow
+from solvers.parallel import solve_parallel, split_game
+from solvers.solution import get_solution
+from utils import Point
+
+pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+
+
+class Test_split_game(unittest.TestCase):
+    def test_prefixes_cover_first_empty_field(self):
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        prefixes = split_game(G, depth=1)
+        self.assertTrue(prefixes)
+        for prefix in prefixes:
+            self.assertEqual(len(prefix), 1)
+            code, x, y, orientation = prefix[0]
+            self.assertTrue(G.grid.can_place(code, at=(x, y), orientation=orientation))
+        self.assertEqual(G.grid.occupied, 0)
+        self.assertEqual(G.pieces_left, pieces)
+
+
+class Test_solve_parallel(unittest.TestCase):
+    def test_find_all_matches_sequential_count(self):
+        for depth in (1, 2):
+            G = Game(grid_shape=(5, 3), pieces=pieces)
+            solutions = solve_parallel(G, depth=depth, workers=2, find_all=True)
+            self.assertEqual(len(solutions), 4)
+            self.assertEqual(G.grid.occupied, 0)
+
+    def test_first_solution_is_placed(self):
+        for solver in ("dlx", "heuristic"):
+            G = Game(grid_shape=(5, 3), pieces=pieces)
+            solution = solve_parallel(G, solver=solver, workers=2)
+            self.assertEqual(len(get_solution(solution)), 3)
+            self.assertTrue(G.grid._is_complete())
+
+    def test_unsolvable(self):
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        self.assertIsNone(solve_parallel(G, solver="heuristic", workers=2))
+
+    def test_find_all_requires_dlx(self):
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        with self.assertRaises(ValueError):
+            solve_parallel(G, solver="heuristic", find_all=True)
+
+    def test_pieces_from_data(self):
+        # Workers get pieces registered from a piece set file, not built in
+        G = make_game(get_instance("pentomino-10x6"))
+        G.place("I", at=Point(0, 0), orientation=1)
+        solution = solve_parallel(G, workers=2)
+        self.assertEqual(len(get_solution(solution)), 11)
+        self.assertTrue(G.grid._is_complete())
@@ -0,0 +1,165 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+from game import Game
+from pieces import (
+    COLORS,
+    DISTINCT_ORIENTATIONS,
+    ORIENTATIONS,
+    PIECE_SETS_DIR,
+    Cyan,
+    Orange,
+    Teal,
+    define_piece,
+    get_piece,
+    load_piece_set,
+    load_pieces,
+    orientation_offsets,
+    parse_shape,
+    piece_definitions,
+    register,
+)
+from solvers.enumeration import count_solutions
+
+
+def footprint(offsets):
+    min_x = min(dx for dx, _ in offsets)
+    min_y = min(dy for _, dy in offsets)
+    return frozenset((dx - min_x, dy - min_y) for dx, dy in offsets)
+
+
+class Test_Piece_orientation_table(unittest.TestCase):
+    def test_table_covers_every_valid_orientation(self):
+        for piece in COLORS:
+            self.assertEqual(
+                set(ORIENTATIONS[piece.code]), set(piece.valid_orientations)
+            )
+
+    def test_offsets_match_traced_piece(self):
+        for piece in COLORS:
+            for orientation in piece.valid_orientations:
+                traced = piece.__new__(piece)
+                traced.assign_neighbours()
+                traced.orientation = 1
+                traced.set_orientation(orientation)
+                offsets = traced.node_offsets()
+                self.assertEqual(
+                    orientation_offsets(piece.code, orientation),
+                    tuple(offsets[n] for n in range(len(offsets))),
+                )
+
+    def test_distinct_orientations_have_distinct_footprints(self):
+        for piece in COLORS:
+            footprints = [
+                footprint(ORIENTATIONS[piece.code][o])
+                for o in DISTINCT_ORIENTATIONS[piece.code]
+            ]
+            self.assertEqual(len(footprints), len(set(footprints)))
+            all_footprints = {
+                footprint(offsets) for offsets in ORIENTATIONS[piece.code].values()
+            }
+            self.assertEqual(set(footprints), all_footprints)
+
+    def test_symmetric_pieces_deduplicated(self):
+        self.assertEqual(len(DISTINCT_ORIENTATIONS[Cyan.code]), 4)
+        self.assertEqual(len(DISTINCT_ORIENTATIONS[Teal.code]), 4)
+
+    def test_unknown_orientation_raises(self):
+        with self.assertRaises(ValueError):
+            orientation_offsets(Cyan.code, 5)
+
+    def test_piece_init_uses_cached_directions(self):
+        self.assertIs(Cyan(orientation=2).directions, Cyan(orientation=2).directions)
+        self.assertEqual(Cyan(orientation=2).orientation, 2)
+
+
+class Test_Piece_definitions(unittest.TestCase):
+    def test_builtin_pieces_keep_their_nodes(self):
+        # Node 0 is the root, wherever it sits in the piece
+        self.assertEqual(Orange.cells, ((0, 0), (-1, 0), (-1, 1), (-2, 1), (-1, 2)))
+        self.assertEqual(Orange.spans, [(3, 3)])
+        self.assertEqual(
+            Cyan(orientation=1).directions, {0: {1: 2}, 1: {0: 0, 2: 1}, 2: {1: 3}}
+        )
+        self.assertIs(get_piece("CY"), Cyan)
+
+    def test_parse_shape(self):
+        self.assertEqual(parse_shape([".#", "##"]), [(1, 0), (0, 1), (1, 1)])
+
+    def test_define_piece(self):
+        piece = define_piece("T1", [(1, 0), (0, 1), (1, 1), (2, 1)], name="Tee")
+        self.assertEqual(piece.__name__, "Tee")
+        self.assertEqual(piece.size, 4)
+        self.assertEqual(piece.cells, ((0, 0), (-1, 1), (0, 1), (1, 1)))
+        self.assertIn("  []\n[][][]", piece.__doc__)
+
+    def test_invalid_pieces(self):
+        with self.assertRaises(ValueError):
+            define_piece("T2", [(0, 0), (2, 0)])
+        with self.assertRaises(ValueError):
+            define_piece("T2", [(0, 0), (0, 0)])
+        with self.assertRaises(ValueError):
+            define_piece("T2", [])
+
+    def test_register(self):
+        domino = define_piece("T3", [(0, 0), (1, 0)])
+        self.assertEqual(register([domino]), [domino])
+        self.assertEqual(domino.spans, [(1, 2), (2, 1)])
+        self.assertEqual(len(DISTINCT_ORIENTATIONS["T3"]), 2)
+        # The same cells again are the same piece, other cells are a clash
+        self.assertEqual(register([define_piece("T3", [(0, 0), (1, 0)])]), [domino])
+        with self.assertRaises(ValueError):
+            register([define_piece("T3", [(0, 0), (0, 1)])])
+        with self.assertRaises(ValueError):
+            get_piece("T4")
+
+    def test_pickle_by_code(self):
+        (piece,) = register([define_piece("T7", [(0, 0), (1, 0), (1, 1)])])
+        copy = pickle.loads(pickle.dumps(piece(orientation=2)))
+        self.assertIsInstance(copy, piece)
+        self.assertEqual(copy.orientation, 2)
+        self.assertEqual(copy.directions, piece(orientation=2).directions)
+
+    def test_definitions_round_trip(self):
+        definitions = piece_definitions(["CY", "OR"])
+        self.assertEqual(definitions[0]["name"], "Cyan")
+        self.assertEqual(load_pieces(definitions), [Cyan, Orange])
+
+
+class Test_load_piece_set(unittest.TestCase):
+    def test_pentominoes(self):
+        pentominoes = load_piece_set(os.path.join(PIECE_SETS_DIR, "pentominoes.json"))
+        self.assertEqual(len(pentominoes), 12)
+        orientations = {p.code: len(DISTINCT_ORIENTATIONS[p.code]) for p in pentominoes}
+        self.assertEqual(orientations["X"], 1)
+        self.assertEqual(orientations["I"], 2)
+        self.assertEqual(orientations["T"], 4)
+        self.assertEqual(orientations["F"], 8)
+        # Loading twice is harmless
+        self.assertEqual(
+            load_piece_set(os.path.join(PIECE_SETS_DIR, "pentominoes.json")),
+            pentominoes,
+        )
+
+    def test_solvers_take_loaded_pieces(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trominoes.json")
+            with open(path, "w") as f:
+                json.dump(
+                    {
+                        "name": "Trominoes",
+                        "pieces": [
+                            {"code": "T5", "shape": ["###"]},
+                            {"code": "T6", "cells": [[0, 0], [0, 1], [1, 1]]},
+                        ],
+                    },
+                    f,
+                )
+            load_piece_set(path)
+
+        # A 3x2 rectangle is two straight trominoes, or two L ones in two ways
+        G = Game(grid_shape=(3, 2), pieces={"T5": 2, "T6": 2})
+        self.assertEqual(count_solutions(G), 3)
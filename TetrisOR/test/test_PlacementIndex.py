@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from game import Grid
+from pieces import COLORS, Cyan
+from solvers import placement_index
+from solvers.placement_index import PlacementIndex, get_placement_index
+from utils import Point
+
+
+class Test_PlacementIndex(unittest.TestCase):
+    def test_matches_grid_placements(self):
+        grid = Grid(5, 4)
+        grid.place(Cyan(), Point(1, 1))
+        index = PlacementIndex(grid.shape)
+        for piece in COLORS:
+            self.assertEqual(
+                set(index.fitting(piece.code, grid.occupied)),
+                set(grid.iter_placements(piece.code)),
+                piece.code,
+            )
+
+    def test_covering_cell(self):
+        index = PlacementIndex((3, 2))
+        # Corners of a 3x2 grid are covered by 3 Cyan placements
+        self.assertEqual(len(index.fitting_cell("CY", 1, 0)), 3)
+        for placement in index.covering["CY"][1 << 4]:
+            self.assertTrue(placement[3] & 1 << 4)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            shape = (7, 3)
+            placement_index._INDEXES.pop(shape, None)
+            built = get_placement_index(shape, cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            placement_index._INDEXES.pop(shape)
+            loaded = get_placement_index(shape, cache_dir=cache_dir)
+            self.assertIsNot(loaded, built)
+            self.assertEqual(loaded.placements, built.placements)
+            self.assertIs(get_placement_index(shape, cache_dir=cache_dir), loaded)
+
+    def test_stale_indexes_removed(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            shape = (7, 3)
+            stale = os.path.join(cache_dir, "placements_7x3_000000000000.pickle")
+            other = os.path.join(cache_dir, "placements_7x4_000000000000.pickle")
+            for path in (stale, other):
+                open(path, "wb").close()
+            placement_index._INDEXES.pop(shape, None)
+            get_placement_index(shape, cache_dir=cache_dir)
+            self.assertFalse(os.path.exists(stale))
+            self.assertTrue(os.path.exists(other))
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_cache_dir_from_environment(self):
+        shape = (7, 3)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch.dict(os.environ, {"TETRISOR_CACHE": cache_dir}):
+                placement_index._INDEXES.pop(shape, None)
+                get_placement_index(shape)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
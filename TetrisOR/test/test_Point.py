@@ -0,0 +1,32 @@
+import unittest
+
+from utils import Point, UNIT_VECTORS
+
+
+class Test_Point(unittest.TestCase):
+    def test_arithmetic(self):
+        self.assertEqual(Point(1, 2) + Point(3, -1), Point(4, 1))
+        self.assertEqual(Point(1, 2) - (1, 1), Point(0, 1))
+        self.assertIsInstance(Point(1, 2) + (0, 0), Point)
+
+    def test_immutable_and_hashable(self):
+        p = Point(1, 2)
+        with self.assertRaises(AttributeError):
+            p.x = 3
+        self.assertEqual(len({p, Point(1, 2)}), 1)
+
+    def test_nested_iteration(self):
+        p = Point(1, 2)
+        self.assertEqual(
+            [(a, b) for a in p for b in p], [(1, 1), (1, 2), (2, 1), (2, 2)]
+        )
+
+    def test_translate(self):
+        cells = Point(2, 1).translate([(0, 0), (0, 1), (1, 1)])
+        self.assertEqual(cells, (Point(2, 1), Point(2, 2), Point(3, 2)))
+
+    def test_unit_vectors_sum_to_origin(self):
+        total = Point()
+        for step in UNIT_VECTORS:
+            total += step
+        self.assertEqual(total, Point(0, 0))
@@ -0,0 +1,124 @@
+import unittest
+
+from benchmarks.catalog import FULL_BOARD_SOLUTION, INSTANCES, make_game
+from game import Game
+from pieces import COLORS
+from solvers.heuristic import solve_brute_force
+from solvers.propagation import check, propagate, reachable_sizes
+from solvers.solution import get_solution
+from solvers.stats import SearchStats
+
+ALL_PIECES = {piece.code: 1 for piece in COLORS}
+
+
+def instance(name):
+    return next(i for i in INSTANCES if i["name"] == name)
+
+
+class Test_StartingPosition(unittest.TestCase):
+    def test_placed_pieces_are_fixed(self):
+        G = Game((11, 5), pieces=ALL_PIECES, placed=FULL_BOARD_SOLUTION[:3])
+        self.assertEqual(G.n_fixed, 3)
+        self.assertEqual(G.pieces_left["CY"], 0)
+        self.assertIsNone(G.undo())
+        self.assertEqual(len(G.history), 3)
+
+    def test_invalid_starting_position(self):
+        with self.assertRaises(ValueError):
+            Game((11, 5), pieces=ALL_PIECES, placed=[("CY", 10, 4, 1)])
+        with self.assertRaises(ValueError):
+            Game((11, 5), pieces={"CY": 1}, placed=[("IN", 1, 0, -2)])
+
+
+class Test_Propagate(unittest.TestCase):
+    def test_reachable_sizes(self):
+        reachable = reachable_sizes([3, 5])
+        self.assertEqual([k for k in range(10) if reachable >> k & 1], [0, 3, 5, 8])
+
+    def test_forces_the_last_pieces(self):
+        G = Game((11, 5), pieces=ALL_PIECES, placed=FULL_BOARD_SOLUTION[:10])
+        self.assertEqual(check(G), (None, FULL_BOARD_SOLUTION[10]))
+        self.assertEqual(propagate(G), FULL_BOARD_SOLUTION[10:])
+        self.assertTrue(G.grid._is_complete())
+
+    def test_only_forceable_pieces_are_forced(self):
+        G = Game((11, 5), pieces=ALL_PIECES, placed=FULL_BOARD_SOLUTION[:10])
+        self.assertEqual(check(G, forceable=["EG"]), (None, None))
+
+    def test_subset_sum_failure(self):
+        # 12 fields, but only room for sums of 5s
+        G = Game((4, 3), pieces={"AB": 1, "MA": 1})
+        stats = SearchStats()
+        self.assertIsNone(propagate(G, stats=stats))
+        self.assertEqual(stats.pruned["subset-sum"], 1)
+        self.assertEqual(G.grid.occupied, 0)
+
+    def test_failure_undoes_forced_pieces(self):
+        # MA is forced, then the last 5 fields do not fit AB
+        pieces = dict(ALL_PIECES, EG=0, AB=2)
+        G = Game((11, 5), pieces=pieces, placed=FULL_BOARD_SOLUTION[:10])
+        occupied, history = G.grid.occupied, list(G.history)
+        self.assertEqual(check(G), (None, FULL_BOARD_SOLUTION[10]))
+        self.assertIsNone(propagate(G))
+        self.assertEqual(G.grid.occupied, occupied)
+        self.assertEqual(G.history, history)
+
+
+class Test_ChallengeSolve(unittest.TestCase):
+    def test_solutions_include_forced_pieces(self):
+        G = make_game(instance("challenge-11x5-hard"))
+        solution = solve_brute_force(G, branching="first-piece")
+        self.assertTrue(G.grid._is_complete())
+        self.assertEqual(len(get_solution(solution)), 12 - G.n_fixed)
+
+    def test_forced_pieces_without_search(self):
+        G = Game((11, 5), pieces=ALL_PIECES, placed=FULL_BOARD_SOLUTION[:10])
+        stats = SearchStats()
+        solution = solve_brute_force(G, stats=stats)
+        self.assertEqual(stats.nodes, 0)
+        self.assertEqual(
+            [(p.code, *point, o) for p, point, o in get_solution(solution)],
+            FULL_BOARD_SOLUTION[10:],
+        )
+
+    def test_forced_pieces_come_first(self):
+        placed = [FULL_BOARD_SOLUTION[i] for i in (0, 1, 2, 3, 4, 5, 6, 8)]
+        G = Game((11, 5), pieces=ALL_PIECES, placed=placed)
+        solution = get_solution(solve_brute_force(G))
+        self.assertEqual(len(solution), 4)
+        self.assertEqual(solution[0][0].code, "YE")
+        self.assertTrue(G.grid._is_complete())
+
+    def test_failed_search_undoes_forced_pieces(self):
+        # YE is forced, then the rest cannot be filled without EG
+        placed = [FULL_BOARD_SOLUTION[i] for i in (0, 1, 2, 3, 4, 5, 6, 8)]
+        G = Game((11, 5), pieces=dict(ALL_PIECES, EG=0, AB=2), placed=placed)
+        history = list(G.history)
+        self.assertIsNone(solve_brute_force(G))
+        self.assertEqual(G.history, history)
+
+    def test_node_propagation_shrinks_search(self):
+        nodes = {}
+        for node_propagation in (False, True):
+            G = make_game(instance("challenge-11x5-medium"))
+            stats = SearchStats()
+            solution = solve_brute_force(
+                G,
+                branching="first-piece",
+                stats=stats,
+                node_propagation=node_propagation,
+            )
+            self.assertIsNotNone(solution)
+            nodes[node_propagation] = stats.nodes
+        self.assertLess(nodes[True], nodes[False])
+
+    def test_unsolvable_without_search(self):
+        G = Game((4, 3), pieces={"AB": 1, "MA": 1})
+        stats = SearchStats()
+        self.assertIsNone(solve_brute_force(G, stats=stats))
+        self.assertEqual(stats.nodes, 0)
+        self.assertEqual(stats.pruned["subset-sum"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
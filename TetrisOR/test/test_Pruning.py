@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from game import Grid
+from pieces import COLORS, Cyan, Red
+from solvers.pruning import EmptyRegions, Region, no_space_left
+from utils import Point
+
+
+def reference_components(grid):
+    """Flood-fill the empty fields of a grid field by field."""
+    C, R = grid.shape
+    empty = {(x, y) for x in range(C) for y in range(R) if not grid[x, y].node[0]}
+    components = set()
+    while empty:
+        stack = [empty.pop()]
+        component = set(stack)
+        while stack:
+            x, y = stack.pop()
+            for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if neighbour in empty:
+                    empty.remove(neighbour)
+                    component.add(neighbour)
+                    stack.append(neighbour)
+        components.add(frozenset(component))
+    return components
+
+
+def maintained_components(regions):
+    return {frozenset(region.cells) for region in regions.regions}
+
+
+class Test_Region(unittest.TestCase):
+    def test_size_span_and_cells(self):
+        # Fields (1, 0), (1, 1), (2, 1) on a 4-wide grid
+        region = Region((1 << 1) | (1 << 5) | (1 << 6), width=4)
+        self.assertEqual(region.size, 3)
+        self.assertEqual(region.span, (2, 2))
+        self.assertEqual(sorted(region.cells), [(1, 0), (1, 1), (2, 1)])
+
+
+class Test_EmptyRegions(unittest.TestCase):
+    def test_empty_grid_is_one_region(self):
+        regions = EmptyRegions(Grid(5, 3))
+        self.assertEqual(len(regions.regions), 1)
+        self.assertEqual(regions.regions[0].size, 15)
+        self.assertEqual(regions.regions[0].span, (5, 3))
+
+    def test_placement_splits_region(self):
+        grid = Grid(3, 4)
+        regions = EmptyRegions(grid)
+        # Fills the middle column
+        piece = Red(orientation=-2)
+        grid.place(piece, Point(0, 0))
+        regions.place(grid.placement_mask(piece))
+        self.assertEqual(maintained_components(regions), reference_components(grid))
+        self.assertEqual(len(regions.regions), 2)
+
+    def test_components_of_any_mask(self):
+        regions = EmptyRegions(Grid(3, 4))
+        # Fields (0, 0), (1, 0) and (2, 2)
+        mask = (1 << 0) | (1 << 1) | (1 << 8)
+        self.assertCountEqual(regions.components(mask), [0b11, 1 << 8])
+        self.assertEqual(regions.components(0), [])
+
+    def test_matches_full_recomputation(self):
+        random.seed(0)
+        for _ in range(20):
+            grid = Grid(6, 5)
+            regions = EmptyRegions(grid)
+            placed = []
+            for _ in range(12):
+                if placed and random.random() < 0.3:
+                    piece = placed.pop(random.randrange(len(placed)))
+                    mask = grid.placement_mask(piece)
+                    grid.unplace(piece)
+                    regions.unplace(mask)
+                else:
+                    P = random.choice(COLORS)
+                    piece = P(orientation=random.choice(P.valid_orientations))
+                    at = Point(random.randrange(6), random.randrange(5))
+                    if grid.place(piece, at):
+                        placed.append(piece)
+                        regions.place(grid.placement_mask(piece))
+                self.assertEqual(
+                    maintained_components(regions), reference_components(grid)
+                )
+
+
+class Test_no_space_left(unittest.TestCase):
+    def test_region_too_small(self):
+        grid = Grid(4, 2)
+        piece = Cyan(orientation=-2)
+        grid.place(piece, Point(0, 0))
+        # Leaves one isolated field at (0, 1) and a 2x2 block
+        regions = EmptyRegions(grid)
+        self.assertTrue(no_space_left(regions, {"CY": 1}))
+
+    def test_piece_does_not_fit_any_span(self):
+        regions = EmptyRegions(Grid(3, 3))
+        self.assertTrue(no_space_left(regions, {"RE": 1}))
+        self.assertFalse(no_space_left(regions, {"CY": 1}))
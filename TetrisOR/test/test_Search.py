@@ -0,0 +1,117 @@
+import sys
+import unittest
+
+from benchmarks.catalog import get_instance, make_game
+from game import Game
+from solvers.heuristic import (
+    branch_first_piece,
+    branch_raster_cell,
+    solve_brute_force,
+)
+from solvers.search import HeuristicSearch
+from solvers.solution import get_solution
+
+
+def placements(solution):
+    return [(piece.code, tuple(point), o) for piece, point, o in get_solution(solution)]
+
+
+class Test_HeuristicSearch(unittest.TestCase):
+    def test_deeper_than_recursion_limit(self):
+        G = Game(grid_shape=(2, 450), pieces={"CY": 300})
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            solution = solve_brute_force(G, branching="raster-cell", symmetry=False)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertIsNotNone(solution)
+        self.assertEqual(len(G.history), 300)
+
+    def test_regions_deeper_than_recursion_limit(self):
+        # A 2x3 block splits the board into two regions of about 150 pieces
+        block = [("CY", 0, 222, -2), ("CY", 1, 224, -4)]
+        G = Game(grid_shape=(2, 450), pieces={"CY": 300}, placed=block)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            solution = solve_brute_force(G, branching="raster-cell", symmetry=False)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertIsNotNone(solution)
+        self.assertTrue(G.grid._is_complete())
+
+    def test_suspend_and_continue(self):
+        expected = placements(
+            solve_brute_force(
+                make_game(get_instance("medium-6x5")),
+                propagation=False,
+                decomposition=False,
+            )
+        )
+
+        G = make_game(get_instance("medium-6x5"))
+        search = HeuristicSearch(G, branch_first_piece, symmetry=True, ordered=True)
+        runs = 0
+        while not search.finished:
+            budget = [50]
+
+            def stop():
+                budget[0] -= 1
+                return budget[0] < 0
+
+            solution = search.run(stop=stop)
+            runs += 1
+            if not search.finished:
+                # Suspended searches keep their placements on the grid
+                self.assertEqual(len(G.history), len(search.position()))
+
+        self.assertGreater(runs, 1)
+        self.assertEqual(placements(solution), expected)
+
+    def test_resume_from_position(self):
+        G = make_game(get_instance("medium-6x5"))
+        first = HeuristicSearch(G, branch_raster_cell)
+        budget = [30]
+
+        def stop():
+            budget[0] -= 1
+            return budget[0] < 0
+
+        self.assertIsNone(first.run(stop=stop))
+        position = first.position()
+        nodes = first.nodes
+        first.abandon()
+        self.assertEqual(G.grid.occupied, 0)
+
+        second = HeuristicSearch(G, branch_raster_cell)
+        second.resume(position)
+        solution = second.run()
+
+        reference = HeuristicSearch(
+            make_game(get_instance("medium-6x5")), branch_raster_cell
+        )
+        self.assertEqual(placements(solution), placements(reference.run()))
+        # Replayed nodes are only counted once
+        self.assertEqual(second.nodes + nodes, reference.nodes)
+
+    def test_stop_during_replay(self):
+        G = make_game(get_instance("medium-6x5"))
+        first = HeuristicSearch(G, branch_raster_cell)
+        budget = [30]
+
+        def stop():
+            budget[0] -= 1
+            return budget[0] < 0
+
+        first.run(stop=stop)
+        position = first.position()
+        first.abandon()
+        self.assertGreater(len(position), 1)
+
+        # Stopping right away still replays the whole saved position
+        second = HeuristicSearch(G, branch_raster_cell)
+        second.resume(position)
+        self.assertIsNone(second.run(stop=lambda: True))
+        self.assertEqual(second.position(), position)
+        self.assertEqual(second.nodes, 0)
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from itertools import islice
+
+from benchmarks.catalog import get_instance, make_game
+from game import Game
+from serialization import (
+    SolutionWriter,
+    _code_bytes,
+    load_puzzle,
+    load_solutions,
+    load_solutions_puzzle,
+    save_puzzle,
+    save_solutions,
+)
+from solvers.enumeration import iter_solutions
+
+
+class Test_puzzles(unittest.TestCase):
+    def test_round_trip_keeps_placed_pieces(self):
+        G = make_game(get_instance("challenge-11x5-easy"))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "puzzle.json")
+            save_puzzle(G, path)
+            loaded = load_puzzle(path)
+        self.assertEqual(loaded.grid.occupied, G.grid.occupied)
+        self.assertEqual(loaded.pieces_left, G.pieces_left)
+        self.assertEqual(loaded.n_pieces, G.n_pieces)
+
+    def test_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "puzzle.json")
+            with open(path, "w") as f:
+                f.write('{"format": "other"}')
+            with self.assertRaises(ValueError):
+                load_puzzle(path)
+
+
+class Test_solutions(unittest.TestCase):
+    def setUp(self):
+        self.G = make_game(get_instance("small-5x4"))
+        self.solutions = list(iter_solutions(self.G))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        for name in ("solutions.bin", "solutions.jsonl"):
+            path = self.path(name)
+            self.assertEqual(
+                save_solutions(path, self.G, self.solutions), len(self.solutions)
+            )
+            self.assertEqual(list(load_solutions(path)), self.solutions, name)
+            self.assertEqual(load_solutions_puzzle(path).n_pieces, self.G.n_pieces)
+
+    def test_long_record(self):
+        # 1200 pieces of 451 bytes each, more than a 16-bit length holds
+        G = Game(grid_shape=(2, 1800), pieces={"CY": 1200})
+        solution = []
+        for y in range(0, 1800, 3):
+            solution += [("CY", 0, y, -2), ("CY", 1, y + 2, -4)]
+        path = self.path("solutions.bin")
+        save_solutions(path, G, [solution])
+        self.assertEqual(list(load_solutions(path)), [solution])
+
+    def test_code_index_width(self):
+        self.assertEqual(_code_bytes(["CY"]), 1)
+        self.assertEqual(_code_bytes(range(256)), 1)
+        self.assertEqual(_code_bytes(range(257)), 2)
+
+    def test_binary_is_smaller(self):
+        save_solutions(self.path("s.bin"), self.G, self.solutions)
+        save_solutions(self.path("s.jsonl"), self.G, self.solutions)
+        self.assertLess(
+            os.path.getsize(self.path("s.bin")), os.path.getsize(self.path("s.jsonl"))
+        )
+
+    def test_resume_after_partial_record(self):
+        for name in ("solutions.bin", "solutions.jsonl"):
+            path = self.path(name)
+            save_solutions(path, self.G, self.solutions[:3])
+            # Simulate a crash in the middle of writing the next record
+            with open(path, "ab") as f:
+                f.write(b"\x20\x00[")
+
+            with SolutionWriter(path, self.G) as writer:
+                self.assertEqual(writer.count, 3)
+                for solution in islice(iter_solutions(self.G), writer.count, None):
+                    writer.append(solution)
+
+            self.assertEqual(list(load_solutions(path)), self.solutions, name)
+
+    def test_rejects_other_puzzle(self):
+        path = self.path("solutions.bin")
+        save_solutions(path, self.G, self.solutions)
+        with self.assertRaises(ValueError):
+            SolutionWriter(path, make_game(get_instance("demo-5x3")))
@@ -0,0 +1,59 @@
+import unittest
+
+from game import Game
+from pieces import COLORS, EmeraldGreen, MintGreen, Yellow
+from solvers.dlx import solve_dlx
+from solvers.heuristic import solve_brute_force
+from solvers.stats import SearchStats
+
+
+class Test_SearchStats(unittest.TestCase):
+    def test_heuristic_counters(self):
+        pieces = {piece.code: 1 for piece in [MintGreen, EmeraldGreen, Yellow]}
+        G = Game(grid_shape=(5, 3), pieces=pieces)
+        stats = SearchStats()
+        solve_brute_force(G, stats=stats)
+
+        self.assertEqual(sum(stats.depths.values()), stats.nodes)
+        self.assertEqual(stats.depths[0], 1)
+        self.assertGreater(stats.attempts, 0)
+        # Out-of-bounds anchors are never tried, see `PlacementIndex`
+        self.assertEqual(stats.rejected["out-of-bounds"], 0)
+        self.assertLessEqual(sum(stats.rejected.values()), stats.attempts)
+        self.assertIn("branching", stats.timings)
+        self.assertIn("no_space_left", stats.timings)
+
+    def test_pruning_rules_fire(self):
+        G = Game(grid_shape=(11, 5), pieces={piece.code: 1 for piece in COLORS})
+        stats = SearchStats()
+        solve_brute_force(G, branching="min-cell", stats=stats)
+        self.assertTrue(stats.pruned)
+        self.assertLessEqual(
+            set(stats.pruned),
+            {
+                "region-size",
+                "piece-span",
+                "subset-sum",
+                "no-placement",
+                "uncovered-field",
+                "decomposition",
+                "region-memo",
+            },
+        )
+
+    def test_callbacks(self):
+        events = []
+        stats = SearchStats(
+            on_node=lambda depth: events.append(("node", depth)),
+            on_backtrack=lambda depth: events.append(("backtrack", depth)),
+        )
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        solve_dlx(G, stats=stats)
+        self.assertEqual(events.count(("node", 0)), 1)
+        self.assertEqual(len(events), stats.nodes + stats.backtracks)
+
+    def test_timed(self):
+        stats = SearchStats()
+        double = stats.timed("double", lambda x: 2 * x)
+        self.assertEqual(double(2), 4)
+        self.assertGreaterEqual(stats.timings["double"], 0)
@@ -0,0 +1,51 @@
+import unittest
+
+from game import Game, Grid
+from pieces import Cyan
+from solvers.symmetry import (
+    board_symmetries,
+    is_canonical,
+    symmetry_breaking_piece,
+    transform_mask,
+)
+from utils import Point
+
+
+class Test_board_symmetries(unittest.TestCase):
+    def test_rectangle_has_three_symmetries(self):
+        self.assertEqual(len(board_symmetries(Grid(5, 3))), 3)
+
+    def test_square_has_seven_symmetries(self):
+        self.assertEqual(len(board_symmetries(Grid(4, 4))), 7)
+
+    def test_symmetries_are_permutations(self):
+        for permutation in board_symmetries(Grid(4, 4)):
+            self.assertEqual(sorted(permutation), list(range(16)))
+
+    def test_occupied_fields_break_symmetry(self):
+        grid = Grid(5, 3)
+        grid.place(Cyan(), Point(0, 0))
+        self.assertEqual(board_symmetries(grid), [])
+
+
+class Test_is_canonical(unittest.TestCase):
+    def test_one_canonical_corner(self):
+        # On a 3x2 grid, the four corners are images of each other
+        symmetries = board_symmetries(Grid(3, 2))
+        corners = [1 << 0, 1 << 2, 1 << 3, 1 << 5]
+        canonical = [c for c in corners if is_canonical(c, symmetries)]
+        self.assertEqual(canonical, [1 << 0])
+
+    def test_transform_mask(self):
+        mirror = board_symmetries(Grid(3, 2))[0]
+        self.assertEqual(transform_mask(0b000011, mirror), 0b000110)
+
+
+class Test_symmetry_breaking_piece(unittest.TestCase):
+    def test_prefers_least_symmetric_single_piece(self):
+        G = Game(grid_shape=(5, 4), pieces={"CY": 2, "TE": 1, "RE": 1})
+        self.assertEqual(symmetry_breaking_piece(G), "RE")
+
+    def test_no_single_piece(self):
+        G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+        self.assertIsNone(symmetry_breaking_piece(G))
@@ -0,0 +1,80 @@
+import unittest
+
+from benchmarks.catalog import get_instance, make_game
+from game import Game
+from solvers.heuristic import solve_brute_force
+from solvers.stats import SearchStats
+from solvers.transposition import TranspositionTable, ZobristHasher
+
+
+class Test_ZobristHasher(unittest.TestCase):
+    def test_incremental_matches_full_hash(self):
+        hasher = ZobristHasher(6, {"CY": 2})
+        h = hasher.hash(0, {"CY": 2})
+        h = hasher.placement(h, 0b011001, "CY", 1)
+        self.assertEqual(h, hasher.hash(0b011001, {"CY": 1}))
+        h = hasher.placement(h, 0b011001, "CY", 1)
+        self.assertEqual(h, hasher.hash(0, {"CY": 2}))
+
+    def test_piece_counts_change_hash(self):
+        hasher = ZobristHasher(6, {"CY": 2, "IN": 1})
+        self.assertNotEqual(
+            hasher.hash(0, {"CY": 2, "IN": 1}), hasher.hash(0, {"CY": 1, "IN": 1})
+        )
+
+
+class Test_TranspositionTable(unittest.TestCase):
+    def test_lru_keeps_recently_matched(self):
+        table = TranspositionTable(max_size=2, eviction="lru")
+        table.add(1)
+        table.add(2)
+        self.assertIn(1, table)
+        table.add(3)
+        self.assertIn(1, table)
+        self.assertNotIn(2, table)
+        self.assertEqual(table.evictions, 1)
+
+    def test_fifo_drops_oldest(self):
+        table = TranspositionTable(max_size=2, eviction="fifo")
+        table.add(1)
+        table.add(2)
+        self.assertIn(1, table)
+        table.add(3)
+        self.assertNotIn(1, table)
+        self.assertEqual(len(table), 2)
+
+    def test_none_rejects_new_states(self):
+        table = TranspositionTable(max_size=1, eviction="none")
+        table.add(1)
+        table.add(2)
+        self.assertIn(1, table)
+        self.assertNotIn(2, table)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(eviction="random")
+
+
+class Test_solve_with_transpositions(unittest.TestCase):
+    def test_prunes_repeated_states(self):
+        G = make_game(get_instance("small-5x4"))
+        stats = SearchStats()
+        table = TranspositionTable()
+        self.assertIsNotNone(solve_brute_force(G, stats=stats, transpositions=table))
+        self.assertTrue(G.grid._is_complete())
+        self.assertGreater(stats.pruned["transposition"], 0)
+        self.assertEqual(table.hits, stats.pruned["transposition"])
+
+    def test_identical_pieces(self):
+        for branching in ("first-piece", "raster-cell"):
+            G = Game(grid_shape=(3, 2), pieces={"CY": 2})
+            solution = solve_brute_force(
+                G, branching=branching, transpositions=TranspositionTable()
+            )
+            self.assertIsNotNone(solution, branching)
+
+    def test_unsolvable(self):
+        G = Game(grid_shape=(4, 4), pieces={"CY": 2, "IN": 1, "MR": 1, "TE": 1})
+        table = TranspositionTable(max_size=4)
+        self.assertIsNone(solve_brute_force(G, transpositions=table))
+        self.assertEqual(G.grid.occupied, 0)